@@ -4,7 +4,8 @@ import subprocess
 import logging
 import time
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, Response
+import metrics
 
 app = Flask(__name__)
 
@@ -143,6 +144,25 @@ def get_logs():
     except:
         return "No logs found."
 
+@app.route('/api/metrics')
+def get_metrics():
+    # Written by main.py every METRICS_INTERVAL seconds
+    snap = metrics.read()
+    if snap is None:
+        return Response("# no metrics yet (is the display running?)\n", mimetype="text/plain")
+    return Response(metrics.render_prometheus(snap), mimetype="text/plain; version=0.0.4")
+
+@app.route('/api/upstreams')
+def get_upstreams():
+    # Circuit breaker state per upstream host, from main.py's metrics file
+    snap = metrics.read()
+    if snap is None:
+        return jsonify({"status": "error", "message": "No data yet (is the display running?)"})
+    names = {0: "closed", 1: "half_open", 2: "open"}
+    hosts = {g["labels"].get("host"): names.get(g["value"], "unknown")
+             for g in snap.get("gauges", []) if g["name"] == "http_breaker_state"}
+    return jsonify({"status": "success", "age": round(time.time() - snap.get("time", 0)), "hosts": hosts})
+
 @app.route('/api/control', methods=['POST'])
 def control():
     data = request.json
@@ -0,0 +1,198 @@
+"""
+Headless render benchmark with golden frames.
+
+Runs main.py's draw functions under SDL's dummy video driver with fixed
+fixture data, reports ms/frame percentiles per slide and compares each
+rendered frame with a stored golden PNG, so render optimisations can be
+shown not to change pixels.
+
+    python3 bench_render.py              # benchmark + compare with goldens
+    python3 bench_render.py --update     # (re)write goldens from this build
+    python3 bench_render.py --cold       # clear text caches before every frame
+
+Goldens depend on the installed fonts; generate them on the device you
+compare on.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import datetime
+import tempfile
+
+import pygame
+import main
+import forecast_store
+from icon_cache import IconCache
+
+# main.py forces fbcon at import time; render off-screen instead
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_DIR = os.path.join(APP_DIR, "bench", "golden")
+
+DATE_INFO = {
+    "time": "07:45",
+    "date_gregorian": "Senin, 12 Januari 2026",
+    "date_javanese": "Senin Wage",
+    "date_hijri": "23 Rajab 1447 H",
+    "timestamp": datetime.datetime(2026, 1, 12, 7, 45),
+}
+
+WEATHER = {
+    "temp": 29.4, "humidity": 78, "pressure": 1009, "wind_speed": 2.1,
+    "description": "Hujan Ringan", "icon_code": "10d", "city": "Wanasari",
+}
+
+SHOLAT = {
+    "Imsak": "04:03", "Subuh": "04:13", "Dzuhur": "11:52", "Ashar": "15:17",
+    "Maghrib": "18:07", "Isya": "19:21",
+}
+
+BMKG_FORECAST = [
+    {"local_datetime": "2026-01-12 09:00:00", "weather": 1, "t": 28, "weather_desc": "Cerah Berawan"},
+    {"local_datetime": "2026-01-12 12:00:00", "weather": 61, "t": 31, "weather_desc": "Hujan Ringan"},
+    {"local_datetime": "2026-01-12 15:00:00", "weather": 95, "t": 27, "weather_desc": "Hujan Petir"},
+]
+# Parsed once, as fetch_bmkg_forecast() does
+BMKG_STORE = forecast_store.build(BMKG_FORECAST)
+
+NEWS = [
+    {"title": "Pemerintah Umumkan Jadwal Libur Nasional dan Cuti Bersama Tahun Depan",
+     "desc": "Keputusan bersama tiga menteri menetapkan 17 hari libur nasional dan 8 hari cuti bersama. "
+             "Masyarakat diimbau merencanakan perjalanan lebih awal untuk menghindari kepadatan."},
+    {"title": "Harga Cabai di Brebes Turun Menjelang Panen Raya",
+     "desc": "Petani menyebut pasokan meningkat dua kali lipat dibanding bulan lalu."},
+]
+
+BMKG_WARNING = {
+    "headline": "Peringatan Dini Cuaca Jawa Tengah",
+    "desc": "Waspada potensi hujan sedang hingga lebat disertai kilat/petir dan angin kencang "
+            "pada pukul 14:00 WIB di Brebes, Tegal, Pemalang dan sekitarnya.",
+}
+
+SPARK_UP = [int(50 + 40 * i / 31 + (i % 5) * 3) for i in range(32)]
+SPARK_DOWN = [100 - v for v in SPARK_UP]
+
+FINANCE = {
+    "usd": {"val": 16235, "change": 0},
+    "gold": {"val": 1512345, "change": 0.8, "spark": SPARK_UP},
+    "btc": {"val": 1523456789, "change": -2.35, "spark": SPARK_DOWN},
+    "eth": {"val": 54321000, "change": 1.1, "spark": SPARK_UP[8:]},
+}
+
+QUOTE = {
+    "text": "Urip iku urup. Hidup itu hendaknya memberi manfaat bagi orang lain di sekitar kita, "
+            "semakin besar manfaat yang bisa kita berikan tentu akan lebih baik.",
+    "author": "Pepatah Jawa",
+}
+
+SYSTEM = {
+    "temp": "48.3 C", "ram_used": 212, "ram_total": 427, "disk_percent": "41%",
+    "ip": "192.168.0.171", "wifi_ssid": "RumahKita",
+}
+
+SLIDES = {
+    "weather": lambda: main.draw_weather_slide(dict(WEATHER), DATE_INFO),
+    "bmkg_forecast": lambda: main.draw_bmkg_forecast_slide(BMKG_STORE, DATE_INFO),
+    "news": lambda: main.draw_news_slide(NEWS, DATE_INFO, 0),
+    "finance": lambda: main.draw_finance_slide(FINANCE, DATE_INFO),
+    "sholat": lambda: main.draw_sholat_slide(SHOLAT, DATE_INFO, "Kertabesuki, Wanasari"),
+    "quote": lambda: main.draw_quote_slide(QUOTE, DATE_INFO),
+    "system": lambda: main.draw_system_slide(SYSTEM, DATE_INFO),
+    "bmkg": lambda: main.draw_bmkg_slide(BMKG_WARNING, DATE_INFO),
+}
+
+def make_fixture_icons(path):
+    """Deterministic stand-in icons so the benchmark never needs the network."""
+    codes = set(main.BMKG_TO_OWM.values()) | {"03d", WEATHER["icon_code"]}
+    for i, code in enumerate(sorted(codes)):
+        surf = pygame.Surface((200, 200), pygame.SRCALPHA)
+        color = (60 + i * 20 % 190, 160, 255 - i * 25 % 200, 255)
+        pygame.draw.circle(surf, color, (100, 100), 70)
+        pygame.draw.circle(surf, (255, 255, 255, 180), (100, 100), 70, 6)
+        pygame.image.save(surf, os.path.join(path, f"{code}.png"))
+
+def setup(icon_dir):
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((480, 320))
+    main.screen = pygame.Surface((480, 320))
+    main.init_fonts()
+    make_fixture_icons(icon_dir)
+    main.ICONS = IconCache(icon_dir)
+
+def render(name):
+    main.screen.fill(main.COLOR_BG)
+    SLIDES[name]()
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+def compare(surface, path):
+    """Returns the number of differing pixels, or None if there is no golden."""
+    if not os.path.exists(path):
+        return None
+    golden = pygame.image.load(path)
+    if golden.get_size() != surface.get_size():
+        return surface.get_width() * surface.get_height()
+    a = pygame.image.tostring(surface, "RGB")
+    b = pygame.image.tostring(golden, "RGB")
+    if a == b:
+        return 0
+    return sum(1 for i in range(0, len(a), 3) if a[i:i + 3] != b[i:i + 3])
+
+def run(frames=50, update=False, cold=False, golden_dir=GOLDEN_DIR, names=None):
+    icon_dir = tempfile.mkdtemp(prefix="bench_icons_")
+    failures = 0
+    try:
+        setup(icon_dir)
+        os.makedirs(golden_dir, exist_ok=True)
+        print(f"{'slide':<14}{'p50':>8}{'p90':>8}{'p99':>8}{'max':>8}  golden")
+        for name in names or SLIDES:
+            times = []
+            for _ in range(frames):
+                if cold:
+                    main.SafeFont.render_cache.clear()
+                t0 = time.perf_counter()
+                render(name)
+                times.append((time.perf_counter() - t0) * 1000)
+
+            golden_path = os.path.join(golden_dir, f"{name}.png")
+            if update:
+                pygame.image.save(main.screen, golden_path)
+                status = "updated"
+            else:
+                diff = compare(main.screen, golden_path)
+                if diff is None:
+                    status = "missing (run with --update)"
+                elif diff == 0:
+                    status = "ok"
+                else:
+                    failures += 1
+                    actual_path = os.path.join(golden_dir, f"{name}.actual.png")
+                    pygame.image.save(main.screen, actual_path)
+                    status = f"DIFF {diff} px -> {actual_path}"
+
+            print(f"{name:<14}{percentile(times, 50):>8.2f}{percentile(times, 90):>8.2f}"
+                  f"{percentile(times, 99):>8.2f}{max(times):>8.2f}  {status}")
+    finally:
+        shutil.rmtree(icon_dir, ignore_errors=True)
+        pygame.quit()
+    return failures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless slide render benchmark")
+    parser.add_argument("--frames", type=int, default=50, help="frames rendered per slide")
+    parser.add_argument("--update", action="store_true", help="write golden PNGs instead of comparing")
+    parser.add_argument("--cold", action="store_true", help="clear the text render cache before each frame")
+    parser.add_argument("--golden-dir", default=GOLDEN_DIR)
+    parser.add_argument("slides", nargs="*", help=f"slides to run (default: all of {', '.join(SLIDES)})")
+    args = parser.parse_args()
+    unknown = [s for s in args.slides if s not in SLIDES]
+    if unknown:
+        parser.error(f"unknown slide(s): {', '.join(unknown)}")
+    sys.exit(1 if run(args.frames, args.update, args.cold, args.golden_dir, args.slides or None) else 0)
@@ -0,0 +1,20 @@
+import time
+
+# Imported first by main.py, so T0 is as close to process start as we get
+T0 = time.perf_counter()
+_last = T0
+phases = []
+
+def mark(name):
+    """Record the time spent since the previous mark under `name`."""
+    global _last
+    now = time.perf_counter()
+    phases.append((name, (now - _last) * 1000))
+    _last = now
+
+def total_ms():
+    return (_last - T0) * 1000
+
+def summary():
+    parts = [f"{name}={ms:.0f}ms" for name, ms in phases]
+    return f"Boot: {' '.join(parts)} total={total_ms():.0f}ms"
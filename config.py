@@ -19,6 +19,8 @@ HEIGHT = 320
 
 # Framebuffer path for Pi
 FB_PATH = "/dev/fb1"
+# "fbcon" = SDL framebuffer console, "fb" = direct mmap of FB_PATH (needs python3-numpy)
+DISPLAY_BACKEND = "fbcon"
 
 # UI Colors (R, G, B)
 BG_COLOR = (5, 6, 12)
@@ -28,8 +30,42 @@ ACCENT_COLOR = (0, 255, 230)
 # Refresh intervals in seconds
 REFRESH_INTERVAL = 180     # 3 minutes - weather updates
 NEWS_INTERVAL = 600         # 10 minutes - news updates
-SHOLAT_INTERVAL = 14400     # 4 hours
+SHOLAT_IHTIYAT = 2          # Safety minutes added to computed prayer times (Kemenag)
 BMKG_INTERVAL = 600         # 10 minutes
+BMKG_FORECAST_INTERVAL = 1800
+FINANCE_INTERVAL = 900      # 15 minutes
+FINANCE_HISTORY_SIZE = 192  # Price samples kept per instrument (2 days at 15 min)
+
+# Adaptive refresh: the intervals above are the minimum. A source waits
+# longer, up to these maxima, while Cache-Control/Expires or the payload's
+# own timestamp (OWM dt, BMKG analysis_date) says nothing new is out yet
+REFRESH_MAX_INTERVAL = 900
+NEWS_MAX_INTERVAL = 1800
+BMKG_MAX_INTERVAL = 1800
+BMKG_FORECAST_MAX_INTERVAL = 10800
+FINANCE_MAX_INTERVAL = 3600
+
+# Background fetch pool
+FETCH_WORKERS = 3           # Max concurrent upstream requests
+FETCH_RETRY_INTERVAL = 30   # Retry delay (s) for a source that has no data yet
+
+# Shared HTTP client (keep-alive pool + retries)
+HTTP_CONNECT_TIMEOUT = 5
+HTTP_READ_TIMEOUT = 10
+HTTP_RETRIES = 2            # Extra attempts on connection errors, 429 and 5xx
+HTTP_BACKOFF_BASE = 1.0     # Jittered exponential backoff: random(0, base * 2^attempt)
+HTTP_BACKOFF_MAX = 15.0
+HTTP_POOL_SIZE = 2          # Kept-alive connections per host
+BREAKER_THRESHOLD = 3       # Consecutive failed requests (after retries) before a host's circuit opens
+BREAKER_COOLDOWN = 60       # Seconds open before a single probe request (doubles per failed probe)
+BREAKER_COOLDOWN_MAX = 900
+STALE_FACTOR = 2            # Data older than STALE_FACTOR x its refresh interval is marked stale
+SNAPSHOT_INTERVAL = 300     # Save last known state to disk at most this often (s)
+METRICS_INTERVAL = 30       # Write cache/metrics.json for /api/metrics (s)
+
+# Render caches
+SLIDE_CACHE_SIZE = 8        # Rendered slide surfaces kept in RAM
+TEXT_CACHE_SIZE = 256       # Rendered text surfaces kept in RAM
 
 CITY_SHOLAT = "Brebes" # Legacy fallback
 NEWS_CATEGORY = "all" 
@@ -48,6 +84,9 @@ AUTO_REBOOT_HOURS = 3
 # Pagination
 NEWS_PER_PAGE = 1
 NEWS_LIMIT = 5
+NEWS_POOL_LIMIT = 40 # Stop parsing the RSS feed after this many items
+NEWS_HISTORY_SIZE = 100 # News items remembered across polls (only new ones are processed)
+NEWS_MAX_AGE = 172800 # Drop items published more than 2 days ago
 
 # UI Layout
 HEADER_HEIGHT = 45
@@ -55,3 +94,4 @@ HEADER_HEIGHT = 45
 # Date Adjustments (Days)
 JAVA_DATE_OFFSET = 0
 HIJRI_DATE_OFFSET = 0
+CALENDAR_PRECOMPUTE_DAYS = 0 # Days of date strings to build ahead at startup (e.g. 1100 for ~3 years)
@@ -1,12 +1,6 @@
 import datetime
-from hijridate import Gregorian
 import config
-
-# Constants for Javanese Date
-PASARAN = ["Legi", "Pahing", "Pon", "Wage", "Kliwon"]
-# Reference: 1 January 2014 was a Wednesday and Legi
-REF_DATE = datetime.date(2014, 1, 1)
-REF_PASARAN_IDX = 0 # Legi
+import javanese_calendar
 
 # Indonesian Localization
 DAYS_ID = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
@@ -16,6 +10,10 @@ MONTHS_HIJRI = ["", "Muharram", "Safar", "Rabi'ul Awal", "Rabi'ul Akhir",
                 "Jumadil Awal", "Jumadil Akhir", "Rajab", "Sya'ban", 
                 "Ramadhan", "Syawal", "Dzulkaidah", "Dzulhijjah"]
 
+# (date, offsets) -> calendar strings. Only the clock changes within a day;
+# grows by one entry per day unless precompute() filled it ahead.
+_calendar_cache = {}
+
 def get_javanese_pasaran(date_obj):
     """
     Calculate Javanese Pasaran (Legi, Pahing, etc.)
@@ -23,16 +21,7 @@ def get_javanese_pasaran(date_obj):
     try:
         # Apply global offset
         adjusted_date = date_obj + datetime.timedelta(days=config.JAVA_DATE_OFFSET)
-        
-        delta = adjusted_date - REF_DATE
-        days_passed = delta.days
-        
-        # Calculate index
-        # User feedback: 12 Jan 2026 should be Wage, but was Kliwon.
-        # Calculation showed Kliwon (4), Reality Wage (3). Difference -1.
-        # Adjusting offset.
-        pasaran_idx = (days_passed + REF_PASARAN_IDX - 1) % 5
-        return PASARAN[pasaran_idx]
+        return javanese_calendar.pasaran(adjusted_date)
     except:
         return ""
 
@@ -41,6 +30,9 @@ def get_hijri_date(date_obj):
     Get Hijri date string (e.g., "10 Ramadhan 1445")
     """
     try:
+        # Imported on first use: keeps hijridate off the boot path
+        from hijridate import Gregorian
+        
         # Apply global offset
         adjusted_date = date_obj + datetime.timedelta(days=config.HIJRI_DATE_OFFSET)
         
@@ -49,36 +41,43 @@ def get_hijri_date(date_obj):
     except Exception as e:
         return ""
 
+def local_now():
+    """Local time from UTC + config.TIMEZONE_OFFSET (handles WIB/WITA/WIT)."""
+    return datetime.datetime.utcnow() + datetime.timedelta(seconds=config.TIMEZONE_OFFSET)
+
+def get_calendar_info(date_obj):
+    """
+    Gregorian, Javanese and Hijri strings for one local date.
+    Computed once per date, then served from the cache.
+    """
+    key = (date_obj, config.JAVA_DATE_OFFSET, config.HIJRI_DATE_OFFSET)
+    info = _calendar_cache.get(key)
+    if info is None:
+        # Standard Date (Indonesian)
+        day_name = DAYS_ID[date_obj.weekday()]
+        month_name = MONTHS_ID[date_obj.month]
+        info = {
+            "date_gregorian": f"{day_name}, {date_obj.day} {month_name} {date_obj.year}",
+            "date_javanese": f"{day_name} {get_javanese_pasaran(date_obj)}",
+            "date_hijri": get_hijri_date(date_obj),
+        }
+        _calendar_cache[key] = info
+    return info
+
+def precompute(start, days):
+    """Fill the calendar cache for `days` dates from `start`; returns the count."""
+    for i in range(days):
+        get_calendar_info(start + datetime.timedelta(days=i))
+    return days
+
 def get_full_date_info():
     """
     Returns a dictionary with formatted date strings.
     Uses config.TIMEZONE_OFFSET to handle WIB/WITA/WIT automatically.
+    Per call this is one clock read; the calendar part is cached per day.
     """
-    # Calculate local time based on UTC + Offset
-    utc_now = datetime.datetime.utcnow()
-    now = utc_now + datetime.timedelta(seconds=config.TIMEZONE_OFFSET)
-    
-    date_obj = now.date()
-    
-    # Standard Date (Indonesian)
-    day_name = DAYS_ID[now.weekday()]
-    month_name = MONTHS_ID[now.month]
-    date_str = f"{day_name}, {now.day} {month_name} {now.year}"
-    
-    # Time
-    time_str = now.strftime("%H:%M")
-    
-    # Javanese
-    pasaran = get_javanese_pasaran(date_obj)
-    javanese_str = f"{day_name} {pasaran}"
-    
-    # Hijri
-    hijri_str = get_hijri_date(date_obj)
-    
-    return {
-        "time": time_str,
-        "date_gregorian": date_str,
-        "date_javanese": javanese_str,
-        "date_hijri": hijri_str,
-        "timestamp": now # for checking update intervals
-    }
+    now = local_now()
+    info = dict(get_calendar_info(now.date()))
+    info["time"] = f"{now.hour:02d}:{now.minute:02d}"
+    info["timestamp"] = now # for checking update intervals
+    return info
@@ -1,155 +1,148 @@
-import requests
+import http_client
 import xml.etree.ElementTree as ET
-import html
+import sanitize
 
-def get_google_news():
+def open_stream(response):
+    """File-like view of a streamed response body (gzip/deflate decoded)"""
+    response.raw.decode_content = True
+    return response.raw
+
+def iter_rss_items(source):
+    """
+    Incrementally parse an RSS feed from a file-like source and yield
+    {child tag: text} per <item> (title, link, guid, pubDate, description...).
+    Each item is cleared once read, so memory stays flat regardless of
+    feed size; callers may stop early.
+    """
+    channel = None
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            if elem.tag == "channel":
+                channel = elem
+            continue
+        if elem.tag == "item":
+            yield {child.tag: child.text or "" for child in elem}
+            elem.clear()
+            if channel is not None:
+                # Drop the finished item from its parent too
+                channel.clear()
+
+# Items seen so far, keyed by GUID; created on first use from config
+_news_store = None
+
+def get_google_news(max_items=None):
     """
     Fetches headline news from Google News RSS (Indonesia) with snippets.
     Improved sanitization for Pygame rendering safety.
+    Only items not seen in an earlier poll are cleaned; returns the whole
+    history (newest first) with "id" and "published" on every item.
     """
-    import random
-    import re
+    import time
     import config
+    from news_store import NewsStore, item_key, parse_pubdate
+    global _news_store
     
+    if max_items is None:
+        max_items = getattr(config, 'NEWS_POOL_LIMIT', 40)
+    if _news_store is None:
+        _news_store = NewsStore(getattr(config, 'NEWS_HISTORY_SIZE', 100), getattr(config, 'NEWS_MAX_AGE', 172800))
+    store = _news_store
     url = "https://news.google.com/rss?hl=id&gl=ID&ceid=ID:id"
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        
-        root = ET.fromstring(response.content)
-        news_items = []
-        
-        # Regex to remove non-printable/non-standard characters that might crash Pygame
-        # Keeps basic Indonesian alphabet, numbers, and common punctuation
-        # Replaces everything else with a space
-        def clean_text(text):
-            if not text: return ""
-            text = html.unescape(text)
-            # Remove HTML tags
-            text = re.sub('<[^<]+?>', '', text)
-            # Remove characters outside common range (basic emojis, rare symbols)
-            # Standard ASCII + typical Latin-1 / Indonesian chars
-            text = "".join(c for c in text if ord(c) < 65535 and not (0 <= ord(c) <= 31 and ord(c) not in [9, 10, 13]))
-            return text.strip()
-
-        for item in root.findall('./channel/item'):
-            title = item.find('title').text
-            desc_html = item.find('description').text
+    
+    def parse(response):
+        seen = 0
+        for item in iter_rss_items(open_stream(response)):
+            seen += 1
+            if seen > max_items:
+                break
+            key = item_key(item.get("guid"), item.get("link"), item.get("title"))
+            if key in store:
+                store.touch(key)
+                continue
             
-            clean_title = clean_text(title)
+            clean_title = sanitize.clean_html(item.get("title"))
             if " - " in clean_title:
-                clean_title = clean_title.rsplit(" - ", 1)[0]
+                clean_title = clean_title.rsplit(" - ", 1)[0].strip()
             
             # Clean up the description snippet
-            clean_desc = clean_text(desc_html)
+            clean_desc = sanitize.clean_html(item.get("description"))
             # Often the description starts with the title, let's remove it
             display_desc = clean_desc.replace(clean_title, "").strip()
             # If after cleaning description is empty, use a fallback
             if not display_desc:
                 display_desc = "Lihat berita selengkapnya di Google News."
 
-            news_items.append({
-                "title": clean_title,
-                "desc": display_desc[:250] + "..." if len(display_desc) > 250 else display_desc
+            # Built from cleaned text, so still clean
+            store.add(key, {
+                "id": key,
+                "title": sanitize.CleanStr(clean_title),
+                "desc": sanitize.CleanStr(display_desc[:250] + "..." if len(display_desc) > 250 else display_desc),
+                "published": parse_pubdate(item.get("pubDate")) or time.time(),
             })
-            
-        return news_items # Return the whole pool, randomization happens in main.py
-    except Exception as e:
-        print(f"Error fetching news: {e}")
-        return []
+        return seen
 
-def get_sholat_times(lat=None, lon=None, city="Jakarta"):
-    """
-    Fetches Sholat times using Aladhan API.
-    Prioritizes Latitude and Longitude if provided.
-    """
-    if lat and lon:
-        url = f"http://api.aladhan.com/v1/timings?latitude={lat}&longitude={lon}&method=20"
-    else:
-        address = f"{city}, Indonesia"
-        url = f"http://api.aladhan.com/v1/timingsByAddress?address={address}&method=20"
-        
     try:
-        response = requests.get(url, timeout=10)
-        if response.status_code != 200 and city != "Jakarta":
-            return get_sholat_times(city="Jakarta")
-            
-        response.raise_for_status()
-        data = response.json()
-        
-        timings = data['data']['timings']
-        hijri_data = data['data']['date']['hijri']
-        
-        hijri_formatted = f"{hijri_data['day']} {hijri_data['month']['en']} {hijri_data['year']}H"
-        
-        important_times = {
-            "Imsak": timings['Imsak'],
-            "Subuh": timings['Fajr'],
-            "Dzuhur": timings['Dhuhr'],
-            "Ashar": timings['Asr'],
-            "Maghrib": timings['Maghrib'],
-            "Isya": timings['Isha'],
-            "hijri_date": hijri_formatted
-        }
-        return important_times
+        # Unchanged feed (304) skips parsing entirely
+        http_client.get_parsed(url, parse, stream=True)
+        store.expire()
+        return store.items() # Return the whole pool, rotation happens in main.py
     except Exception as e:
-        print(f"Error fetching sholat times: {e}")
-        if city != "Jakarta":
-            return get_sholat_times(city="Jakarta")
-        return None
-
-def get_javanese_date():
-    """
-    Fetches Javanese date info from tanggalanjawa.com.
-    """
-    import datetime
-    now = datetime.datetime.now()
-    url = f"https://tanggalanjawa.com/api/calendar?year={now.year}&month={now.month}&day={now.day}"
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        return f"{data['weekday']} {data['pasaran']}"
-    except Exception as e:
-        print(f"Error fetching Javanese date: {e}")
-        return None
+        print(f"Error fetching news: {e}")
+        return []
 
 def get_bmkg_warning(province="Jawa Tengah", city=None):
     """
-    Fetches latest weather warning from BMKG RSS feed.
+    Fetches latest weather warning from BMKG RSS feed. Returns None when
+    the feed has no warning for the province; fetch errors (including an
+    open circuit) are raised so the last known warning is kept.
     """
     url = "https://cuaca.bmkg.go.id/data/public/cap/feed/id/rss.xml"
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        
-        # Normalize search province (remove prefixes like DKI, DAERAH ISTIMEWA)
-        search_term = province.upper()
-        for prefix in ["DKI ", "DAERAH ISTIMEWA ", "PROVINSI "]:
-            if search_term.startswith(prefix):
-                search_term = search_term.replace(prefix, "").strip()
-        
-        root = ET.fromstring(response.content)
-        for item in root.findall('.//item'):
-            title = item.find('title').text
-            description = item.find('description').text
-            
+    
+    # Normalize search province (remove prefixes like DKI, DAERAH ISTIMEWA)
+    search_term = province.upper()
+    for prefix in ["DKI ", "DAERAH ISTIMEWA ", "PROVINSI "]:
+        if search_term.startswith(prefix):
+            search_term = search_term.replace(prefix, "").strip()
+    
+    def parse(response):
+        # Stops reading the feed at the first matching item
+        for item in iter_rss_items(open_stream(response)):
+            title, description = item.get("title", ""), item.get("description", "")
             # Match normalized search term
             if search_term.lower() in title.lower() or search_term.lower() in description.lower():
                 return {
-                    "headline": html.unescape(title),
-                    "desc": html.unescape(description)
+                    "headline": sanitize.clean_html(title),
+                    "desc": sanitize.clean_html(description)
                 }
         return None
+    
+    try:
+        return http_client.get_parsed(url, parse, cache_key=(url, search_term), stream=True)
     except Exception as e:
         print(f"Error fetching BMKG warning: {e}")
-        return None
+        raise
+
+BMKG_ANALYSIS_PERIOD = 6 * 3600 # BMKG reruns its forecast a few times a day
+
+def hint_bmkg_analysis(forecasts):
+    """The next BMKG run is not expected before analysis_date (UTC) + BMKG_ANALYSIS_PERIOD."""
+    import datetime
+    import fetcher
+    try:
+        stamp = max(fc['analysis_date'] for fc in forecasts if fc.get('analysis_date'))
+        analysed = datetime.datetime.fromisoformat(stamp.replace("Z", "")).replace(tzinfo=datetime.timezone.utc)
+        fetcher.hint_expires(analysed.timestamp() + BMKG_ANALYSIS_PERIOD)
+    except (ValueError, TypeError, AttributeError):
+        pass
 
 def get_bmkg_forecast(location_id):
     """
     Fetches 3-hourly forecast from BMKG for a specific village ID (adm4).
     Location ID format example: '3329122001' -> converts to '33.29.12.2001'
+    Returns a cleaned forecast_store table, built once per changed payload
+    (a 304 returns the cached table as is).
     """
+    import forecast_store
     if not location_id or len(str(location_id)) < 10:
         return None
         
@@ -162,50 +155,58 @@ def get_bmkg_forecast(location_id):
             adm4 = s
             
         url = f"https://api.bmkg.go.id/publik/prakiraan-cuaca?adm4={adm4}"
-        r = requests.get(url, timeout=10)
-        r.raise_for_status()
-        data = r.json()
         
-        # Structure is data['data'][0]['cuaca'][0] -> list of intervals
-        # But structure might be nested lists. Based on curl: "cuaca": [[{...}, {...}]]
-        if 'data' in data and len(data['data']) > 0:
-             cuaca_list = data['data'][0]['cuaca']
-             # Flatten if it's list of lists
-             forecasts = []
-             for item in cuaca_list:
-                 if isinstance(item, list):
-                     forecasts.extend(item)
-                 else:
-                     forecasts.append(item)
-             return forecasts
-        return None
+        def parse(r):
+            data = r.json()
+            
+            # Structure is data['data'][0]['cuaca'][0] -> list of intervals
+            # But structure might be nested lists. Based on curl: "cuaca": [[{...}, {...}]]
+            if 'data' in data and len(data['data']) > 0:
+                 cuaca_list = data['data'][0]['cuaca']
+                 # Flatten if it's list of lists
+                 forecasts = []
+                 for item in cuaca_list:
+                     if isinstance(item, list):
+                         forecasts.extend(item)
+                     else:
+                         forecasts.append(item)
+                 hint_bmkg_analysis(forecasts)
+                 return sanitize.clean_data(forecast_store.build(forecasts))
+            return None
+        
+        return http_client.get_parsed(url, parse)
     except Exception as e:
         print(f"BMKG Forecast Error: {e}")
         return None
 
+# Last good value per finance key, served while its upstream is failing
+_finance_last = {}
+
 def get_finance_data():
     """
     Fetches Crypto (BTC, ETH), USD Rate, and Gold Price (XAU).
     Source: CoinGecko (Crypto) & Frankfurter (Forex).
     Returns dict: {'usd': 15000, 'btc': 1000000000, 'eth': 50000000, 'gold': 1200000}
+    A failing source keeps its last good values; returns None if both
+    sources fail and nothing good is known, so the previous data stays up.
     """
     results = {}
     
     # 1. Get USD -> IDR
     try:
-        r = requests.get("https://api.frankfurter.app/latest?from=USD&to=IDR", timeout=10)
+        r = http_client.get("https://api.frankfurter.app/latest?from=USD&to=IDR")
         data = r.json()
         usd_rate = data['rates']['IDR']
         # USD: Change will be calculated locally or set to 0
         results['usd'] = {'val': int(usd_rate), 'change': 0}
-    except:
-        results['usd'] = {'val': 16000, 'change': 0} # Fallback
+    except Exception as e:
+        print(f"Forex API Error: {e}")
         
     # 2. Get Crypto (BTC, ETH) & Gold (PAX Gold)
     try:
         # CoinGecko: Add include_24hr_change=true
         url = "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin,ethereum,pax-gold&vs_currencies=idr&include_24hr_change=true"
-        r = requests.get(url, timeout=10)
+        r = http_client.get(url)
         data = r.json()
         
         results['btc'] = {
@@ -228,11 +229,16 @@ def get_finance_data():
         
     except Exception as e:
         print(f"Finance API Error: {e}")
-        # Fallbacks (preserving structure)
-        results['btc'] = results.get('btc', {'val': 0, 'change': 0})
-        results['eth'] = results.get('eth', {'val': 0, 'change': 0})
-        results['gold'] = results.get('gold', {'val': 0, 'change': 0})
-        
+        for key in ('btc', 'eth', 'gold'):
+            results.pop(key, None)
+
+    _finance_last.update(results)
+    if not results:
+        return None
+    # Fallbacks (preserving structure); 'stale' keeps them out of the price history
+    for key in ('usd', 'btc', 'eth', 'gold'):
+        if key not in results:
+            results[key] = dict(_finance_last.get(key, {'val': 0, 'change': 0}), stale=True)
     return results
 
 def get_system_info():
@@ -296,24 +302,42 @@ def get_system_info():
     except:
         info['wifi_signal'] = 'N/A'
     
+    # Upstreams whose circuit breaker is open or probing
+    info['net_down'] = http_client.down_hosts()
+    
     return info
 
-# Global cache for quotes
+# Packed quote store (quote_store.py), opened on first use; QUOTES_CACHE
+# only holds the parsed JSON when the packed file cannot be used
+QUOTES_STORE = None
 QUOTES_CACHE = []
 
 def get_random_quote():
     """
-    Fetch random quote from local JSON file.
-    Source: /home/pi/weather/quotes.json
+    Random quote from the packed, memory-mapped quote store, built from
+    quotes.json next to this file (falls back to parsing the JSON).
     """
-    global QUOTES_CACHE
+    global QUOTES_STORE, QUOTES_CACHE
     import json
     import random
+    import quote_store
+    
+    if QUOTES_STORE is None and not QUOTES_CACHE:
+        QUOTES_STORE = quote_store.open_store()
+        if QUOTES_STORE is not None:
+            print(f"Mapped {len(QUOTES_STORE)} quotes from {quote_store.QUOTES_BIN}")
+    
+    if QUOTES_STORE is not None and len(QUOTES_STORE):
+        try:
+            item = QUOTES_STORE.get(random.randrange(len(QUOTES_STORE)))
+            return {'text': item['quote'], 'author': item['author'] or 'Unknown'}
+        except Exception as e:
+            print(f"Error reading quote store: {e}")
     
     # Load if empty
     if not QUOTES_CACHE:
         try:
-            with open('/home/pi/weather/quotes.json', 'r', encoding='utf-8') as f:
+            with open(quote_store.QUOTES_JSON, 'r', encoding='utf-8') as f:
                 QUOTES_CACHE = json.load(f)
             print(f"Loaded {len(QUOTES_CACHE)} quotes from local file.")
         except Exception as e:
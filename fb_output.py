@@ -0,0 +1,156 @@
+# Optional backend: needs NumPy (apt install python3-numpy).
+# Without it available() returns False and main.py keeps the fbcon path.
+import os
+import mmap
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def available():
+    return np is not None
+
+def read_fb_geometry(path):
+    """Returns (width, height, bpp, stride) from sysfs, e.g. /sys/class/graphics/fb1."""
+    name = os.path.basename(path)
+    base = f"/sys/class/graphics/{name}"
+    with open(f"{base}/virtual_size") as f:
+        width, height = [int(x) for x in f.read().strip().split(",")]
+    with open(f"{base}/bits_per_pixel") as f:
+        bpp = int(f.read().strip())
+    try:
+        with open(f"{base}/stride") as f:
+            stride = int(f.read().strip())
+    except (OSError, ValueError):
+        stride = width * bpp // 8
+    return width, height, bpp, stride
+
+def to_rgb565(surface, rotate=0):
+    """
+    Fused conversion: RGB888 canvas -> rotated RGB565 array of shape (rows, cols).
+    Rotation is counter-clockwise in 90 degree steps, same as pygame.transform.rotate.
+    """
+    import pygame.surfarray
+    # pixels3d is a (x, y, 3) view on the surface memory; transpose/rot90 are
+    # views too, so the only full-frame write is the packed result below
+    rgb = pygame.surfarray.pixels3d(surface).transpose(1, 0, 2)
+    k = (rotate // 90) % 4
+    if k:
+        rgb = np.rot90(rgb, k)
+    r = rgb[..., 0].astype(np.uint16)
+    g = rgb[..., 1].astype(np.uint16)
+    b = rgb[..., 2].astype(np.uint16)
+    del rgb  # release the surface lock held by the view
+    return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+
+class FramebufferOutput:
+    """
+    Writes the canvas straight into an mmapped /dev/fbN.
+    Replaces rotate -> blit to the SDL surface -> flip with a single
+    RGB565+rotation pass, and only rows that differ from the previous frame
+    are copied into the framebuffer.
+    """
+    def __init__(self, path, rotate=0, geometry=None):
+        if np is None:
+            raise RuntimeError("numpy is not installed")
+        width, height, bpp, stride = geometry or read_fb_geometry(path)
+        if bpp != 16:
+            raise RuntimeError(f"{path} is {bpp} bpp, only RGB565 is supported")
+        self.path = path
+        self.rotate = rotate
+        self.width = width
+        self.height = height
+        self._fd = os.open(path, os.O_RDWR)
+        self._mm = mmap.mmap(self._fd, stride * height, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+        # (rows, stride/2) view; columns past `width` are stride padding
+        self._fb = np.ndarray((height, stride // 2), dtype=np.uint16, buffer=self._mm)
+        self._prev = None
+        self.rows_written = 0
+
+    def push(self, surface):
+        """Write the canvas to the framebuffer. Returns the number of rows written."""
+        frame = to_rgb565(surface, self.rotate)
+        rows = min(frame.shape[0], self.height)
+        cols = min(frame.shape[1], self.width)
+        frame = frame[:rows, :cols]
+
+        if self._prev is None or self._prev.shape != frame.shape:
+            changed = np.arange(rows)
+        else:
+            changed = np.flatnonzero((frame != self._prev).any(axis=1))
+        if changed.size:
+            # Contiguous spans keep each write a single memcpy-like slice
+            splits = np.flatnonzero(np.diff(changed) != 1) + 1
+            for span in np.split(changed, splits):
+                lo, hi = span[0], span[-1] + 1
+                self._fb[lo:hi, :cols] = frame[lo:hi]
+        self._prev = frame
+        self.rows_written += int(changed.size)
+        return int(changed.size)
+
+    def close(self):
+        try:
+            self._mm.close()
+        finally:
+            os.close(self._fd)
+
+def benchmark(frames=100, rotate=0, path=None):
+    """
+    Compare the fbcon-style path (rotate + blit to a 16-bit surface) with the
+    fused NumPy conversion. Writes to `path` if given (e.g. /dev/fb1),
+    otherwise to an anonymous buffer so it runs on any machine.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    pygame.display.init()
+    canvas = pygame.Surface((480, 320), 0, 32)
+    target16 = pygame.Surface((480, 320), 0, 16)
+
+    def scribble(i):
+        canvas.fill((5, 6, 12))
+        pygame.draw.rect(canvas, (255, 200, 60), (20 + i % 200, 40, 120, 80))
+
+    t0 = time.perf_counter()
+    for i in range(frames):
+        scribble(i)
+        out = pygame.transform.rotate(canvas, rotate) if rotate else canvas
+        target16.blit(out, (0, 0))
+    fbcon_ms = (time.perf_counter() - t0) * 1000 / frames
+
+    if path:
+        fb = FramebufferOutput(path, rotate)
+    else:
+        size = (320, 480) if rotate in (90, 270) else (480, 320)
+        fb = _MemoryFramebuffer(size, rotate)
+    t0 = time.perf_counter()
+    for i in range(frames):
+        scribble(i)
+        fb.push(canvas)
+    fb_ms = (time.perf_counter() - t0) * 1000 / frames
+    rows = fb.rows_written / frames
+
+    print(f"fbcon path : {fbcon_ms:6.2f} ms/frame (full frame)")
+    print(f"numpy fb   : {fb_ms:6.2f} ms/frame ({rows:.0f} rows/frame written)")
+    pygame.quit()
+    return fbcon_ms, fb_ms
+
+class _MemoryFramebuffer(FramebufferOutput):
+    """FramebufferOutput over an anonymous buffer, for benchmarking off-device."""
+    def __init__(self, size, rotate=0):
+        self.rotate = rotate
+        self.height, self.width = size[1], size[0]
+        self._buf = bytearray(self.width * self.height * 2)
+        self._fb = np.ndarray((self.height, self.width), dtype=np.uint16, buffer=self._buf)
+        self._prev = None
+        self.rows_written = 0
+
+    def close(self):
+        pass
+
+if __name__ == "__main__":
+    import sys
+    import config
+    dev = sys.argv[1] if len(sys.argv) > 1 else None
+    benchmark(rotate=config.ROTATE_ANGLE, path=dev)
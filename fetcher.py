@@ -0,0 +1,200 @@
+import json
+import threading
+import time
+import zlib
+import metrics
+from concurrent.futures import ThreadPoolExecutor
+
+DEBUG_LOG = "/home/pi/weather/debug.log"
+
+def log_debug(msg):
+    try:
+        with open(DEBUG_LOG, "a") as f:
+            f.write(f"{msg}\n")
+    except:
+        pass
+
+# Per worker thread: earliest time the running fetch's data may change
+_expiry = threading.local()
+
+def hint_expires(when):
+    """
+    Called while a fetch runs (by http_client from Cache-Control/Expires,
+    or by a parser from a payload timestamp): this data is not expected
+    to change before `when` (epoch seconds). The earliest hint wins.
+    """
+    if when is None:
+        return
+    current = getattr(_expiry, 'when', None)
+    if current is None or when < current:
+        _expiry.when = when
+
+def pop_expiry_hint():
+    """Return and clear this thread's hint."""
+    when = getattr(_expiry, 'when', None)
+    _expiry.when = None
+    return when
+
+class DataStore:
+    """
+    Thread-safe holder for the latest payload of every data source.
+    Fetch workers write into it, the render loop reads from it.
+    Each key carries a version counter that is bumped only when the payload
+    hash changes, so a refetch of identical data does not invalidate cached
+    slides. on_change(key), if set, is called from the writing thread
+    whenever a version is bumped.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.on_change = None
+        self._data = {}
+        self._versions = {}
+        self._hashes = {}
+        self._updated = {}
+        self._ttls = {}
+        self._expires = {}
+
+    @staticmethod
+    def payload_hash(value):
+        try:
+            blob = json.dumps(value, sort_keys=True, default=str)
+        except (TypeError, ValueError):
+            blob = repr(value)
+        return zlib.crc32(blob.encode("utf-8", "ignore"))
+
+    def set(self, key, value, fetched_at=None):
+        """
+        Store value. Returns True if the payload differed from the previous one.
+        fetched_at overrides the update time (used when restoring a snapshot).
+        """
+        h = self.payload_hash(value)
+        with self._lock:
+            self._data[key] = value
+            self._updated[key] = fetched_at or time.time()
+            changed = key not in self._versions or self._hashes.get(key) != h
+            if changed:
+                self._hashes[key] = h
+                self._versions[key] = self._versions.get(key, 0) + 1
+        if changed and self.on_change:
+            self.on_change(key)
+        return changed
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._data.get(key, default)
+
+    def version(self, key):
+        with self._lock:
+            return self._versions.get(key, 0)
+
+    def updated_at(self, key):
+        with self._lock:
+            return self._updated.get(key, 0)
+
+    def set_ttl(self, key, ttl):
+        """Seconds after its last update that a value counts as stale."""
+        with self._lock:
+            self._ttls[key] = ttl
+
+    def ttl(self, key):
+        with self._lock:
+            return self._ttls.get(key)
+
+    def set_expires(self, key, when):
+        """Upstream's hint for when the value may next change (None: unknown)."""
+        with self._lock:
+            self._expires[key] = when
+
+    def expires(self, key):
+        with self._lock:
+            return self._expires.get(key)
+
+    def is_stale(self, key, now=None):
+        with self._lock:
+            ttl = self._ttls.get(key)
+            if ttl is None or self._data.get(key) is None:
+                return False
+            return (now or time.time()) - self._updated.get(key, 0) > ttl
+
+    def export(self, keys):
+        """{key: (value, updated_at, ttl)} for every key that holds a value."""
+        with self._lock:
+            return {k: (self._data[k], self._updated.get(k, 0), self._ttls.get(k))
+                    for k in keys if self._data.get(k) is not None}
+
+class FetchExecutor:
+    """
+    Bounded worker pool that runs data refreshes off the render thread.
+    A source is never queued twice: submit() is ignored while a previous
+    job for the same key is still running. run() is the same for jobs that
+    produce no data (watchdog, icon downloads): nothing is published to
+    the store and no fetch metrics are recorded.
+    """
+    def __init__(self, store, max_workers=3):
+        self.store = store
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+        self._lock = threading.Lock()
+        self._inflight = set()
+
+    def busy(self, key):
+        with self._lock:
+            return key in self._inflight
+
+    def submit(self, key, func, *args, allow_none=False, **kwargs):
+        """
+        Schedule func(*args, **kwargs) and publish its result under key.
+        None results are dropped (last good value is kept) unless allow_none is set.
+        Returns False if a job for this key is already in flight.
+        """
+        return self._dispatch(key, self._run, key, func, args, kwargs, allow_none)
+
+    def run(self, key, func, *args, **kwargs):
+        """
+        Schedule a side-effect job func(*args, **kwargs); its result is ignored.
+        Returns False if a job for this key is already in flight.
+        """
+        return self._dispatch(key, self._run_task, key, func, args, kwargs)
+
+    def _dispatch(self, key, target, *args):
+        with self._lock:
+            if key in self._inflight:
+                return False
+            self._inflight.add(key)
+        try:
+            self._pool.submit(target, *args)
+        except RuntimeError:
+            # Pool already shut down
+            with self._lock:
+                self._inflight.discard(key)
+            return False
+        return True
+
+    def _run(self, key, func, args, kwargs, allow_none):
+        t0 = time.perf_counter()
+        pop_expiry_hint()
+        try:
+            result = func(*args, **kwargs)
+            if result is not None or allow_none:
+                self.store.set_expires(key, pop_expiry_hint())
+                self.store.set(key, result)
+            else:
+                metrics.REGISTRY.inc("fetch_errors_total", source=key)
+        except Exception as e:
+            metrics.REGISTRY.inc("fetch_errors_total", source=key)
+            log_debug(f"Fetch error ({key}): {e}")
+        finally:
+            metrics.REGISTRY.observe("fetch_seconds", time.perf_counter() - t0, source=key)
+            with self._lock:
+                self._inflight.discard(key)
+
+    def _run_task(self, key, func, args, kwargs):
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            log_debug(f"Task error ({key}): {e}")
+        finally:
+            with self._lock:
+                self._inflight.discard(key)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
@@ -0,0 +1,203 @@
+"""
+Price history per finance instrument in fixed-size ring buffers backed by
+array('d'), persisted to cache/finance.bin. Used by the finance fetch to
+add locally computed 1h/24h change, 24h min/max and a sparkline to the
+payload, so the slide never touches the history itself.
+
+File format (little endian):
+    header   "WPFH", u16 version, u16 instrument count
+    per instrument: 8s name, u32 capacity, u32 count,
+                    then count (f64 time, f64 value) pairs, oldest first
+"""
+import os
+import time
+import struct
+from array import array
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORY_FILE = os.path.join(APP_DIR, "cache", "finance.bin")
+
+MAGIC = b"WPFH"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+SERIES = struct.Struct("<8sII")
+
+INSTRUMENTS = ("usd", "btc", "eth", "gold")
+HOUR = 3600
+DAY = 86400
+SPARK_POINTS = 32
+SPARK_SCALE = 100   # sparkline values are 0..SPARK_SCALE
+
+class RingBuffer:
+    """Last `capacity` (time, value) samples in two preallocated arrays."""
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.times = array('d', bytes(8 * capacity))
+        self.values = array('d', bytes(8 * capacity))
+        self.count = 0
+        self.head = 0   # next slot to write
+
+    def append(self, t, value):
+        self.times[self.head] = t
+        self.values[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def _slot(self, i):
+        """Physical slot of the i-th oldest sample."""
+        return (self.head - self.count + i) % self.capacity
+
+    def time_at(self, i):
+        return self.times[self._slot(i)]
+
+    def value_at(self, i):
+        return self.values[self._slot(i)]
+
+    def last(self):
+        if not self.count:
+            return None, None
+        return self.time_at(self.count - 1), self.value_at(self.count - 1)
+
+    def index_at_or_before(self, t):
+        """Newest sample with time <= t (binary search), or -1."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.time_at(mid) <= t:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo - 1
+
+    def change(self, seconds):
+        """
+        Percent change of the latest value against `seconds` earlier. None if
+        the history does not reach back that far, or only across a gap
+        (the base sample must be less than 1.5 x `seconds` old).
+        """
+        t_last, v_last = self.last()
+        if t_last is None:
+            return None
+        i = self.index_at_or_before(t_last - seconds)
+        if i < 0 or t_last - self.time_at(i) > seconds * 1.5:
+            return None
+        base = self.value_at(i)
+        return (v_last - base) / base * 100 if base else None
+
+    def window_range(self, since):
+        lo = hi = None
+        for i in range(max(0, self.index_at_or_before(since)), self.count):
+            if self.time_at(i) < since:
+                continue
+            v = self.value_at(i)
+            lo = v if lo is None or v < lo else lo
+            hi = v if hi is None or v > hi else hi
+        return lo, hi
+
+    def sparkline(self, since, until, points=SPARK_POINTS):
+        """
+        Value at the end of each of `points` equal time buckets in
+        [since, until], scaled to 0..SPARK_SCALE. Buckets before the first
+        sample are left out.
+        """
+        lo, hi = self.window_range(since)
+        if lo is None:
+            return []
+        span = (hi - lo) or 1.0
+        step = (until - since) / points
+        out = []
+        for b in range(1, points + 1):
+            i = self.index_at_or_before(since + b * step)
+            if i < 0:
+                continue
+            out.append(int(round((self.value_at(i) - lo) / span * SPARK_SCALE)))
+        return out
+
+class FinanceHistory:
+    def __init__(self, capacity=192, path=HISTORY_FILE):
+        self.path = path
+        self.series = {key: RingBuffer(capacity) for key in INSTRUMENTS}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "rb") as f:
+                magic, version, n = HEADER.unpack(f.read(HEADER.size))
+                if magic != MAGIC or version != VERSION:
+                    return
+                for _ in range(n):
+                    name, capacity, count = SERIES.unpack(f.read(SERIES.size))
+                    pairs = array('d')
+                    pairs.frombytes(f.read(16 * count))
+                    ring = self.series.get(name.rstrip(b"\0").decode("ascii", "ignore"))
+                    if ring is None:
+                        continue
+                    for i in range(0, len(pairs), 2):
+                        ring.append(pairs[i], pairs[i + 1])
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Finance history load error: {e}")
+
+    def save(self):
+        """Atomically rewrite the history file."""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(HEADER.pack(MAGIC, VERSION, len(self.series)))
+                for name, ring in self.series.items():
+                    f.write(SERIES.pack(name.encode("ascii"), ring.capacity, ring.count))
+                    pairs = array('d')
+                    for i in range(ring.count):
+                        pairs.append(ring.time_at(i))
+                        pairs.append(ring.value_at(i))
+                    pairs.tofile(f)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            print(f"Finance history save error: {e}")
+
+    def record(self, key, t, value):
+        ring = self.series.get(key)
+        if ring is None or not value or value <= 0:
+            return
+        t_last, _ = ring.last()
+        if t_last is not None and t <= t_last:
+            return
+        ring.append(t, float(value))
+
+_history = None
+
+def annotate(data, now=None):
+    """
+    Record a get_finance_data() result and add, per instrument: change_1h,
+    min_24h, max_24h and spark (a 24h sparkline). 'change' becomes the
+    local 24h change once a day of history exists; until then the
+    upstream figure (0 for USD) stays. Entries marked 'stale' (served
+    from the last good value) are not recorded.
+    """
+    import config
+    global _history
+    if _history is None:
+        _history = FinanceHistory(getattr(config, 'FINANCE_HISTORY_SIZE', 192))
+    now = now or time.time()
+    data = dict(data)
+    for key, entry in data.items():
+        if not isinstance(entry, dict):
+            continue
+        entry = data[key] = dict(entry)
+        if not entry.get('stale'):
+            _history.record(key, now, entry.get('val'))
+        ring = _history.series.get(key)
+        if ring is None or not ring.count:
+            continue
+        change_24h = ring.change(DAY)
+        if change_24h is not None:
+            entry['change'] = round(change_24h, 2)
+        change_1h = ring.change(HOUR)
+        entry['change_1h'] = round(change_1h, 2) if change_1h is not None else None
+        lo, hi = ring.window_range(now - DAY)
+        entry['min_24h'], entry['max_24h'] = lo, hi
+        entry['spark'] = ring.sparkline(now - DAY, now)
+    _history.save()
+    return data
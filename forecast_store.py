@@ -0,0 +1,49 @@
+"""
+BMKG forecast slots parsed once at fetch time into time-sorted parallel
+columns, so the forecast slide never parses dates while drawing.
+
+Times are "local epochs": the forecast's local wall-clock time read as
+if it were UTC, comparable with the same conversion of date_info['timestamp'].
+Plain lists keep the store JSON-friendly for DataStore hashing and snapshots.
+"""
+import calendar
+import datetime
+from bisect import bisect_right
+
+DESC_MAX = 15
+
+def local_epoch(dt):
+    return calendar.timegm(dt.timetuple())
+
+def build(forecasts):
+    """
+    Raw BMKG items ({'local_datetime', 'weather', 't', 'weather_desc', ...})
+    -> {"time": [...], "code": [...], "temp": [...], "hour": [...], "day": [...], "desc": [...]}
+    sorted by time. Items without a parsable local_datetime are dropped.
+    """
+    rows = []
+    for fc in forecasts or ():
+        try:
+            dt = datetime.datetime.strptime(fc.get('local_datetime', ''), "%Y-%m-%d %H:%M:%S")
+        except (TypeError, ValueError):
+            continue
+        desc = str(fc.get('weather_desc', ''))
+        if len(desc) > DESC_MAX:
+            desc = desc[:DESC_MAX - 2] + ".."
+        rows.append((local_epoch(dt), fc.get('weather', 3), fc.get('t', 0),
+                     dt.strftime("%H:%M"), dt.strftime("%d/%m"), desc))
+    rows.sort(key=lambda r: r[0])
+    columns = ("time", "code", "temp", "hour", "day", "desc")
+    return {name: [r[i] for r in rows] for i, name in enumerate(columns)}
+
+def upcoming(store, now, n=3):
+    """
+    Indices of the slot in progress at `now` (a local epoch) and the next
+    ones, at most n. Falls back to the last n slots once all are past.
+    """
+    times = store.get("time") or []
+    if not times:
+        return range(0)
+    start = max(0, bisect_right(times, now) - 1)
+    start = min(start, max(0, len(times) - n))
+    return range(start, min(len(times), start + n))
@@ -0,0 +1,71 @@
+import zlib
+import pygame
+
+class FrameDiffer:
+    """
+    Finds which parts of the canvas changed since the last pushed frame.
+
+    A CRC32 of the whole pixel buffer short-circuits identical frames. When
+    the hash differs, the buffer is compared in horizontal bands of
+    `band_height` rows and adjacent dirty bands are merged, so a clock tick
+    only pushes the rows holding the digits over SPI.
+    """
+    def __init__(self, band_height=16):
+        self.band_height = band_height
+        self._prev = None
+        self._prev_hash = None
+        self._prev_size = None
+        self.frames_skipped = 0
+        self.frames_partial = 0
+        self.frames_full = 0
+
+    def reset(self):
+        """Forget the previous frame so the next diff returns the full screen."""
+        self._prev = None
+        self._prev_hash = None
+
+    def diff(self, surface):
+        """
+        Returns None if the frame is identical to the previous one, otherwise
+        a list of pygame.Rect covering the changed rows.
+        """
+        raw = surface.get_buffer().raw
+        frame_hash = zlib.crc32(raw)
+        w, h = surface.get_size()
+
+        if self._prev is not None and self._prev_size == (w, h) and frame_hash == self._prev_hash:
+            self.frames_skipped += 1
+            return None
+
+        prev = self._prev
+        self._prev = raw
+        self._prev_hash = frame_hash
+        if prev is None or self._prev_size != (w, h):
+            self._prev_size = (w, h)
+            self.frames_full += 1
+            return [pygame.Rect(0, 0, w, h)]
+
+        pitch = surface.get_pitch()
+        band = self.band_height
+        rects = []
+        start = None
+        for y in range(0, h, band):
+            lo = y * pitch
+            hi = min(y + band, h) * pitch
+            if raw[lo:hi] != prev[lo:hi]:
+                if start is None:
+                    start = y
+            elif start is not None:
+                rects.append(pygame.Rect(0, start, w, y - start))
+                start = None
+        if start is not None:
+            rects.append(pygame.Rect(0, start, w, h - start))
+
+        if not rects:
+            self.frames_skipped += 1
+            return None
+        if len(rects) == 1 and rects[0].height == h:
+            self.frames_full += 1
+        else:
+            self.frames_partial += 1
+        return rects
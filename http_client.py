@@ -0,0 +1,282 @@
+import time
+import random
+import threading
+from urllib.parse import urlsplit
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import config
+import fetcher
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+_session = None
+_lock = threading.Lock()
+_stats = {"requests": 0, "retries": 0, "failures": 0, "not_modified": 0}
+# cache key -> {"etag", "last_modified", "result"} for conditional requests
+_validators = {}
+# host -> CircuitBreaker
+_breakers = {}
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without touching the network while a host's breaker is open."""
+
+class CircuitBreaker:
+    """
+    Per-host breaker. CLOSED passes requests; BREAKER_THRESHOLD consecutive
+    failed requests (connection errors, timeouts, 429/5xx once get()'s
+    retries are used up) OPEN it, failing calls instantly for the
+    cooldown. Then it goes HALF_OPEN and lets exactly one probe through:
+    success closes it, failure re-opens it with the cooldown doubled (up
+    to BREAKER_COOLDOWN_MAX).
+    """
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, host):
+        self.host = host
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.cooldown = getattr(config, 'BREAKER_COOLDOWN', 60)
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                return True
+            # Open, or half-open with the probe still in flight
+            return False
+
+    def probing(self):
+        with self._lock:
+            return self.state == self.HALF_OPEN
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.cooldown = getattr(config, 'BREAKER_COOLDOWN', 60)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN:
+                self.cooldown = min(self.cooldown * 2, getattr(config, 'BREAKER_COOLDOWN_MAX', 900))
+            elif self.failures < getattr(config, 'BREAKER_THRESHOLD', 3):
+                return
+            if self.state != self.OPEN:
+                print(f"Circuit open for {self.host} ({self.failures} failures, retry in {self.cooldown}s)")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def snapshot(self):
+        with self._lock:
+            retry_in = 0
+            if self.state == self.OPEN:
+                retry_in = max(0, int(self.cooldown - (time.monotonic() - self.opened_at)))
+            return {"state": self.state, "failures": self.failures, "retry_in": retry_in}
+
+def breaker_for(url):
+    host = urlsplit(url).hostname or url
+    with _lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(host)
+        return breaker
+
+def breakers():
+    """{host: {"state", "failures", "retry_in"}} for every host contacted so far."""
+    with _lock:
+        items = list(_breakers.items())
+    return {host: b.snapshot() for host, b in items}
+
+def down_hosts():
+    """Hosts whose breaker is not closed, e.g. for the system slide."""
+    return sorted(host for host, b in breakers().items() if b["state"] != CircuitBreaker.CLOSED)
+
+def get_session():
+    """
+    The one requests.Session every upstream call goes through. Its adapters
+    keep a keep-alive connection pool per host, so repeat polls skip the
+    TCP+TLS handshake.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            s = requests.Session()
+            pool_hosts = getattr(config, 'HTTP_POOL_HOSTS', 10)
+            pool_size = getattr(config, 'HTTP_POOL_SIZE', 2)
+            for prefix in ("http://", "https://"):
+                s.mount(prefix, HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_size))
+            s.headers["User-Agent"] = "WeatherPi/2.0"
+            _session = s
+        return _session
+
+def _backoff(attempt, retry_after=None):
+    base = getattr(config, 'HTTP_BACKOFF_BASE', 1.0)
+    cap = getattr(config, 'HTTP_BACKOFF_MAX', 15.0)
+    if retry_after is not None:
+        return min(retry_after, cap)
+    # Full jitter: spreads retries from several fetch workers apart
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+def freshness(response):
+    """
+    Seconds the response stays fresh per Cache-Control max-age (minus Age)
+    or Expires - Date; 0 for no-cache/no-store, None if the server is silent.
+    """
+    headers = response.headers
+    cache_control = headers.get("Cache-Control", "").lower()
+    if "no-cache" in cache_control or "no-store" in cache_control:
+        return 0
+    for part in cache_control.split(","):
+        name, _, value = part.strip().partition("=")
+        if name == "max-age":
+            try:
+                return max(0, int(value) - int(headers.get("Age", 0)))
+            except ValueError:
+                return None
+    expires = headers.get("Expires")
+    if expires:
+        try:
+            date = parsedate_to_datetime(headers["Date"]) if "Date" in headers else None
+            expires_at = parsedate_to_datetime(expires)
+            if date is None:
+                return max(0, expires_at.timestamp() - time.time())
+            return max(0, (expires_at - date).total_seconds())
+        except (TypeError, ValueError, IndexError):
+            return 0
+    return None
+
+def get(url, timeout=None, retries=None, **kwargs):
+    """
+    GET through the shared pool with jittered exponential backoff.
+    Connection errors, timeouts and 429/5xx are retried up to `retries`
+    times; the last response is returned (callers still raise_for_status)
+    and the last exception is re-raised.
+    Raises CircuitOpenError straight away while the host's breaker is open.
+    The breaker sees one failure per call, after the retries; a half-open
+    probe is not retried, its own result decides.
+    """
+    if timeout is None:
+        timeout = (getattr(config, 'HTTP_CONNECT_TIMEOUT', 5), getattr(config, 'HTTP_READ_TIMEOUT', 10))
+    if retries is None:
+        retries = getattr(config, 'HTTP_RETRIES', 2)
+    session = get_session()
+    breaker = breaker_for(url)
+
+    for attempt in range(retries + 1):
+        if not breaker.allow():
+            raise CircuitOpenError(f"circuit open for {breaker.host}")
+        last = attempt >= retries or breaker.probing()
+        with _lock:
+            _stats["requests"] += 1
+            if attempt:
+                _stats["retries"] += 1
+        try:
+            r = session.get(url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if last:
+                breaker.record_failure()
+                with _lock:
+                    _stats["failures"] += 1
+                raise
+            time.sleep(_backoff(attempt))
+            continue
+        except Exception:
+            breaker.record_failure()
+            raise
+
+        if r.status_code not in RETRY_STATUS:
+            breaker.record_success()
+            fresh = freshness(r)
+            if fresh is not None:
+                fetcher.hint_expires(time.time() + fresh)
+            return r
+        if not last:
+            retry_after = r.headers.get("Retry-After")
+            try:
+                retry_after = float(retry_after) if retry_after else None
+            except ValueError:
+                retry_after = None
+            r.close()
+            time.sleep(_backoff(attempt, retry_after))
+            continue
+        breaker.record_failure()
+        return r
+
+def get_parsed(url, parse, cache_key=None, **kwargs):
+    """
+    Conditional GET: sends If-None-Match / If-Modified-Since from the last
+    response for this URL and returns the previously parsed result on 304,
+    so unchanged feeds are neither downloaded nor parsed again.
+    parse(response) runs only for a 200 with a fresh body; pass stream=True
+    to let it read response.raw incrementally. Use cache_key when the parsed
+    result depends on more than the URL.
+    """
+    key = cache_key or url
+    entry = _validators.get(key)
+    headers = dict(kwargs.pop("headers", None) or {})
+    if entry:
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    r = get(url, headers=headers, **kwargs)
+    if r.status_code == 304 and entry:
+        with _lock:
+            _stats["not_modified"] += 1
+        r.close()
+        # Payload timestamps are not re-read on 304; replay the parser's hint
+        fetcher.hint_expires(entry["expires"])
+        return entry["result"]
+    r.raise_for_status()
+
+    header_hint = fetcher.pop_expiry_hint()
+    try:
+        result = parse(r)
+    finally:
+        # Streaming parsers may stop early; release the connection either way
+        r.close()
+    payload_hint = fetcher.pop_expiry_hint()
+    fetcher.hint_expires(header_hint)
+    fetcher.hint_expires(payload_hint)
+    etag = r.headers.get("ETag")
+    last_modified = r.headers.get("Last-Modified")
+    if etag or last_modified:
+        _validators[key] = {"etag": etag, "last_modified": last_modified, "result": result,
+                            "expires": payload_hint}
+    else:
+        _validators.pop(key, None)
+    return result
+
+def stats():
+    """
+    Request/retry totals plus per-host pool figures from urllib3:
+    `connections` is how many sockets (TCP+TLS handshakes) were opened,
+    `reused` how many requests rode an existing keep-alive connection.
+    """
+    with _lock:
+        result = dict(_stats)
+    hosts = {}
+    session = _session
+    if session is not None:
+        for adapter in session.adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host = pool.host
+                h = hosts.setdefault(host, {"requests": 0, "connections": 0, "reused": 0})
+                h["requests"] += pool.num_requests
+                h["connections"] += pool.num_connections
+                h["reused"] += max(0, pool.num_requests - pool.num_connections)
+    result["hosts"] = hosts
+    return result
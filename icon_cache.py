@@ -0,0 +1,119 @@
+import io
+import os
+import threading
+from collections import OrderedDict
+import pygame
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+ICON_DIR = os.path.join(APP_DIR, "cache", "icons")
+ICON_URL = "http://openweathermap.org/img/wn/{}@4x.png"
+
+class IconCache:
+    """
+    Two-tier store for OpenWeatherMap icons.
+    Disk tier: original PNGs under cache/icons, survives reboots.
+    RAM tier: LRU of surfaces keyed by (icon_code, size), already scaled and
+    converted to the display format, so drawing an icon is a single blit.
+
+    get() never touches the network. Codes that are not on disk yet are
+    collected in `missing` and fetched by download_missing() on a worker.
+    """
+    def __init__(self, cache_dir=ICON_DIR, max_items=32):
+        self.cache_dir = cache_dir
+        self.max_items = max_items
+        self._surfaces = OrderedDict()
+        self._lock = threading.Lock()
+        self.missing = set()
+        self.hits = 0
+        self.misses = 0
+        # Bumped whenever a new icon reaches the disk tier; lets callers
+        # invalidate anything rendered while that icon was still missing
+        self.version = 0
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+        except OSError:
+            pass
+
+    def _path(self, code):
+        return os.path.join(self.cache_dir, f"{code}.png")
+
+    def has(self, code):
+        return os.path.exists(self._path(code))
+
+    def get(self, code, size):
+        """Return a display-ready surface of size (size, size), or None if not cached yet."""
+        key = (code, size)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        with self._lock:
+            if code in self.missing:
+                return None
+        if not self.has(code):
+            with self._lock:
+                self.missing.add(code)
+            return None
+
+        try:
+            raw = pygame.image.load(self._path(code))
+        except Exception as e:
+            # Corrupt or not an image: drop it so download_missing() fetches it again
+            print(f"Icon load error ({code}): {e}")
+            try:
+                os.remove(self._path(code))
+            except OSError:
+                pass
+            with self._lock:
+                self.missing.add(code)
+            return None
+        try:
+            surf = pygame.transform.smoothscale(raw.convert_alpha(), (size, size))
+        except Exception as e:
+            print(f"Icon scale error ({code}): {e}")
+            return None
+
+        self._surfaces[key] = surf
+        if len(self._surfaces) > self.max_items:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def download(self, code):
+        """Fetch one icon to the disk tier. Blocking; call from a fetch worker."""
+        if self.has(code):
+            return True
+        import http_client
+        try:
+            r = http_client.get(ICON_URL.format(code))
+            r.raise_for_status()
+            # Reject bodies that are not a loadable image (e.g. an HTML error page)
+            pygame.image.load(io.BytesIO(r.content), f"{code}.png")
+            tmp = self._path(code) + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(r.content)
+            os.replace(tmp, self._path(code))
+            self.version += 1
+            return True
+        except Exception as e:
+            print(f"Icon download error ({code}): {e}")
+            return False
+
+    def prefetch(self, codes):
+        """Download every code not on disk yet. Returns the number now available."""
+        ok = 0
+        for code in set(codes):
+            if self.download(code):
+                ok += 1
+        return ok
+
+    def download_missing(self):
+        with self._lock:
+            pending = list(self.missing)
+        done = [code for code in pending if self.download(code)]
+        with self._lock:
+            self.missing.difference_update(done)
+        return len(done)
+
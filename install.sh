@@ -37,11 +37,33 @@ cp app.py $INSTALL_DIR/
 cp config.py $INSTALL_DIR/
 cp date_utils.py $INSTALL_DIR/
 cp ext_services.py $INSTALL_DIR/
+cp fetcher.py $INSTALL_DIR/
+cp icon_cache.py $INSTALL_DIR/
+cp scheduler.py $INSTALL_DIR/
+cp frame_diff.py $INSTALL_DIR/
+cp slide_cache.py $INSTALL_DIR/
+cp fb_output.py $INSTALL_DIR/
+cp bench_render.py $INSTALL_DIR/
+cp text_layout.py $INSTALL_DIR/
+cp boot_profile.py $INSTALL_DIR/
+cp snapshot.py $INSTALL_DIR/
+cp metrics.py $INSTALL_DIR/
+cp http_client.py $INSTALL_DIR/
+cp prayer_times.py $INSTALL_DIR/
+cp javanese_calendar.py $INSTALL_DIR/
+cp forecast_store.py $INSTALL_DIR/
+cp sanitize.py $INSTALL_DIR/
+cp news_store.py $INSTALL_DIR/
+cp finance_history.py $INSTALL_DIR/
+cp quote_store.py $INSTALL_DIR/
 cp weather_service.py $INSTALL_DIR/
 cp quotes.json $INSTALL_DIR/
 cp requirements.txt $INSTALL_DIR/
 cp -r templates $INSTALL_DIR/
 
+# Pack quotes.json for memory-mapped access (also rebuilt on first use)
+python3 $INSTALL_DIR/quote_store.py || echo "WARNING: quote store not built, quotes.json will be used"
+
 # Set permissions
 chmod +x $INSTALL_DIR/*.py
 
@@ -0,0 +1,121 @@
+"""
+Offline Javanese calendar: weekday + pasaran, wuku, Sultan Agungan
+month/year and neptu for any Gregorian date, so no web lookup is needed.
+
+Civil dates are used (the Javanese day really starts at sunset).
+Years follow the arithmetic windu/kurup cycle: Ehe, Dal and Jimakir
+have 355 days, and every 120 years one day is dropped (kurup Asapon,
+Alip years starting on Selasa Pon, runs 1867-1986 AJ).
+
+    python3 javanese_calendar.py [YYYY-MM-DD]   # check KNOWN_DATES, print a day
+"""
+import datetime
+
+DAYS = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+PASARAN = ["Legi", "Pahing", "Pon", "Wage", "Kliwon"]
+WUKU = ["Sinta", "Landep", "Wukir", "Kurantil", "Tolu", "Gumbreg", "Warigalit",
+        "Warigagung", "Julungwangi", "Sungsang", "Galungan", "Kuningan", "Langkir",
+        "Mandasiya", "Julungpujut", "Pahang", "Kuruwelut", "Marakeh", "Tambir",
+        "Medangkungan", "Maktal", "Wuye", "Manahil", "Prangbakat", "Bala", "Wugu",
+        "Wayang", "Kulawu", "Dukut", "Watugunung"]
+MONTHS = ["Sura", "Sapar", "Mulud", "Bakdamulud", "Jumadilawal", "Jumadilakir",
+          "Rejeb", "Ruwah", "Pasa", "Sawal", "Sela", "Besar"]
+YEARS = ["Alip", "Ehe", "Jimawal", "Je", "Dal", "Be", "Wawu", "Jimakir"]
+
+# Neptu (day values) per weekday (DAYS order) and per pasaran
+NEPTU_DAY = [4, 3, 7, 8, 6, 9, 5]
+NEPTU_PASARAN = [5, 9, 7, 4, 8]
+
+YEAR_LENGTHS = [354, 355, 354, 354, 355, 354, 354, 355]
+WINDU_DAYS = sum(YEAR_LENGTHS)          # 2835 = 405 weeks = 567 pasaran cycles
+KURUP_WINDU = 15                        # 120 years
+
+# 1 Sura Alip 1867 AJ = Selasa Pon, 24 March 1936 (start of kurup Asapon)
+EPOCH = datetime.date(1936, 3, 24).toordinal()
+EPOCH_YEAR = 1867
+# Sunday that opened wuku Sinta (Galungan fell on Rabu Kliwon 2024-02-28)
+WUKU_EPOCH = datetime.date(2023, 12, 17).toordinal()
+
+# (date, "Weekday Pasaran", wuku, day, month, year, year name, neptu)
+KNOWN_DATES = [
+    ("1936-03-24", "Selasa Pon", None, 1, "Sura", 1867, "Alip", 10),
+    ("1945-08-17", "Jumat Legi", None, 9, "Pasa", 1876, "Ehe", 11),      # 9 Ramadhan 1364 H
+    ("2024-02-28", "Rabu Kliwon", "Galungan", None, None, None, None, 15),
+    ("2024-03-09", "Sabtu Kliwon", "Kuningan", None, None, None, None, 17),
+    ("2024-07-08", "Senin Legi", None, 1, "Sura", 1958, "Je", 9),
+    ("2025-06-27", "Jumat Kliwon", None, 1, "Sura", 1959, "Dal", 14),
+    ("2026-01-12", "Senin Wage", None, None, None, None, None, 8),
+    ("2052-08-26", "Senin Pahing", None, 1, "Sura", 1987, "Alip", 13),  # kurup Anenhing
+]
+
+def pasaran(date):
+    return PASARAN[date.toordinal() % 5]
+
+def wuku(date):
+    return WUKU[((date.toordinal() - WUKU_EPOCH) // 7) % 30]
+
+def neptu(date):
+    return NEPTU_DAY[date.weekday()] + NEPTU_PASARAN[date.toordinal() % 5]
+
+def _year_start(year):
+    """Ordinal of 1 Sura of Javanese year `year`."""
+    n = year - EPOCH_YEAR
+    windu = n // 8
+    # Each kurup change drops one day
+    return EPOCH + windu * WINDU_DAYS - windu // KURUP_WINDU + sum(YEAR_LENGTHS[:n % 8])
+
+def _month_lengths(year):
+    long_year = YEAR_LENGTHS[(year - EPOCH_YEAR) % 8] == 355
+    return [30, 29] * 5 + [30, 30 if long_year else 29]
+
+def javanese_date(date):
+    """(day, month index, year) in the Sultan Agungan calendar."""
+    ordinal = date.toordinal()
+    year = EPOCH_YEAR + int((ordinal - EPOCH) // (WINDU_DAYS / 8.0))
+    while _year_start(year + 1) <= ordinal:
+        year += 1
+    while _year_start(year) > ordinal:
+        year -= 1
+    day = ordinal - _year_start(year)
+    for month, length in enumerate(_month_lengths(year)):
+        if day < length:
+            return day + 1, month, year
+        day -= length
+
+def get_info(date):
+    day, month, year = javanese_date(date)
+    return {
+        "weekday": DAYS[date.weekday()],
+        "pasaran": pasaran(date),
+        "wuku": wuku(date),
+        "day": day,
+        "month": MONTHS[month],
+        "year": year,
+        "year_name": YEARS[(year - EPOCH_YEAR) % 8],
+        "neptu": neptu(date),
+    }
+
+def check():
+    """Compare against KNOWN_DATES; returns a list of mismatch descriptions."""
+    errors = []
+    for iso, day_pasaran, wuku_name, day, month, year, year_name, neptu_value in KNOWN_DATES:
+        info = get_info(datetime.date.fromisoformat(iso))
+        expected = {"weekday_pasaran": day_pasaran, "wuku": wuku_name, "day": day, "month": month,
+                    "year": year, "year_name": year_name, "neptu": neptu_value}
+        actual = dict(info, weekday_pasaran=f"{info['weekday']} {info['pasaran']}")
+        for key, value in expected.items():
+            if value is not None and actual[key] != value:
+                errors.append(f"{iso} {key}: expected {value}, got {actual[key]}")
+    return errors
+
+if __name__ == "__main__":
+    import sys
+    errors = check()
+    for e in errors:
+        print("MISMATCH", e)
+    print(f"{len(KNOWN_DATES)} known dates, {len(errors)} mismatches")
+    day = datetime.date.fromisoformat(sys.argv[1]) if len(sys.argv) > 1 else datetime.date.today()
+    info = get_info(day)
+    print(f"{day}: {info['weekday']} {info['pasaran']}, {info['day']} {info['month']} "
+          f"{info['year']} {info['year_name']}, wuku {info['wuku']}, neptu {info['neptu']}")
+    sys.exit(1 if errors else 0)
@@ -1,5 +1,6 @@
 import os
 import sys
+import boot_profile
 
 # MUST SET ENVIRONMENT BEFORE ANY PYGAME IMPORT
 os.environ["SDL_FBDEV"] = "/dev/fb1"
@@ -8,16 +9,30 @@ os.environ["SDL_NOMOUSE"] = "1"
 
 import time
 import pygame
-import requests
-from io import BytesIO
+boot_profile.mark("import_pygame")
 import config
-from weather_service import get_weather
 import date_utils
-import ext_services
 import datetime
 import random
-import textwrap
+import json
+import text_layout
+import sanitize
+import forecast_store
 import importlib
+from collections import OrderedDict
+import fetcher as fetcher_mod
+from icon_cache import IconCache
+from scheduler import Scheduler
+from frame_diff import FrameDiffer
+from slide_cache import SlideCache
+import snapshot
+import metrics
+# requests/hijridate/numpy users (weather_service, ext_services, fb_output)
+# are imported where first needed, so the first frame does not wait on them
+boot_profile.mark("import_app")
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+FONT_CACHE_FILE = os.path.join(APP_DIR, "cache", "fonts.json")
 
 # --- GLOBAL HANDLES ---
 screen = None # This will be the Virtual Canvas
@@ -29,6 +44,7 @@ FONT_TINY = None
 FONT_MED_BOLD = None
 FONT_NEWS = None
 FONT_HEADER = None
+ICONS = None # IconCache, created in main()
 
 COLOR_BG = (5, 6, 12)
 COLOR_TEXT_MAIN = (255, 255, 255)
@@ -39,29 +55,118 @@ COLOR_CITY = (100, 255, 180)
 COLOR_DANGER = (248, 81, 73)
 
 def safe_str(text):
-    """Remove characters that crash Pygame 1.9.6"""
-    if not isinstance(text, str):
-        text = str(text)
-    return "".join(c for c in text if ord(c) <= 0xFFFF)
+    """Remove characters that crash Pygame 1.9.6 (free for text cleaned at ingest)"""
+    return sanitize.ensure_clean(text)
 
 class SafeFont:
-    """Wrapper that auto-sanitizes text before rendering"""
-    def __init__(self, font):
+    """
+    Wrapper that auto-sanitizes text before rendering.
+    Rendered surfaces are kept in a bounded LRU shared by all fonts, keyed by
+    (font, text, antialias, color, background); callers must treat returned
+    surfaces as read-only. size() results are memoized per font.
+    """
+    render_cache = OrderedDict()
+    render_cache_size = 256
+    hits = 0
+    misses = 0
+    
+    def __init__(self, font, synthetic_bold=False):
         self.font = font
+        self.synthetic_bold = synthetic_bold   # set_bold() on a regular face
+        self._sizes = {}
+        self._atlas_chars = None
+        self._atlas = {}
+    
+    def enable_atlas(self, chars, samples=()):
+        """
+        Compose strings made only of `chars` from pre-rendered glyphs (e.g. the
+        big clock). Glyphs are placed by their metrics advance, which knows
+        nothing of kerning or synthetic bold, so the atlas stays off for
+        synthetically emboldened fonts and whenever a sample string composed
+        from glyphs does not match font.render() pixel for pixel.
+        """
+        if self.synthetic_bold:
+            return False
+        samples = list(samples) or ["".join(sorted(set(chars)))]
+        try:
+            if all(self._same_pixels(self._render_atlas(text, True, (255, 255, 255)),
+                                     self.font.render(text, True, (255, 255, 255)))
+                   for text in samples):
+                self._atlas_chars = frozenset(chars)
+                return True
+        except Exception as e:
+            print(f"Glyph atlas check failed: {e}")
+        self._atlas_chars = None
+        self._atlas.clear()
+        return False
+    
+    @staticmethod
+    def _same_pixels(a, b):
+        """Compare two text surfaces as they look blitted onto black."""
+        if a.get_size() != b.get_size():
+            return False
+        flat = []
+        for surf in (a, b):
+            bg = pygame.Surface(surf.get_size())
+            bg.blit(surf, (0, 0))
+            flat.append(pygame.image.tostring(bg, "RGB"))
+        return flat[0] == flat[1]
+    
+    def _glyph(self, ch, antialias, color):
+        key = (ch, antialias, color)
+        glyph = self._atlas.get(key)
+        if glyph is None:
+            surf = self.font.render(ch, antialias, color).convert_alpha()
+            advance = self.font.metrics(ch)[0][4]
+            glyph = (surf, advance)
+            self._atlas[key] = glyph
+        return glyph
+    
+    def _render_atlas(self, text, antialias, color):
+        glyphs = [self._glyph(ch, antialias, color) for ch in text]
+        width = sum(adv for _, adv in glyphs[:-1]) + glyphs[-1][0].get_width()
+        surf = pygame.Surface((max(1, width), self.font.get_height()), pygame.SRCALPHA)
+        x = 0
+        for g, adv in glyphs:
+            # MAX keeps coverage exact where neighbouring glyph boxes touch
+            surf.blit(g, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            x += adv
+        return surf
     
     def render(self, text, antialias, color, background=None):
+        key = (id(self), text, antialias, tuple(color), tuple(background) if background else None)
+        cache = SafeFont.render_cache
+        surf = cache.get(key)
+        if surf is not None:
+            cache.move_to_end(key)
+            SafeFont.hits += 1
+            return surf
+        SafeFont.misses += 1
         try:
             clean = safe_str(text)
-            if background:
-                return self.font.render(clean, antialias, color, background)
-            return self.font.render(clean, antialias, color)
+            if not background and self._atlas_chars and clean and self._atlas_chars.issuperset(clean):
+                surf = self._render_atlas(clean, antialias, key[3])
+            elif background:
+                surf = self.font.render(clean, antialias, color, background)
+            else:
+                surf = self.font.render(clean, antialias, color)
         except Exception as e:
             # Fallback if render fails (e.g. wide char issue despite sanitize)
-            print(f"Font Render Error: {e} | Text: {text.encode('utf-8', 'ignore')}")
+            print(f"Font Render Error: {e} | Text: {str(text).encode('utf-8', 'ignore')}")
             return self.font.render("?", antialias, color)
+        cache[key] = surf
+        if len(cache) > SafeFont.render_cache_size:
+            cache.popitem(last=False)
+        return surf
     
     def size(self, text):
-        return self.font.size(safe_str(text))
+        result = self._sizes.get(text)
+        if result is None:
+            if len(self._sizes) > 1024:
+                self._sizes.clear()
+            result = self.font.size(safe_str(text))
+            self._sizes[text] = result
+        return result
     
     def get_height(self):
         return self.font.get_height()
@@ -69,19 +174,58 @@ class SafeFont:
     def get_rect(self):
         return self.font.get_rect()
 
+def resolve_font_paths(font_names):
+    """
+    Find the regular and bold font files once and persist them, so later
+    boots skip pygame's system font scan (fc-list) entirely. Only complete
+    results are cached, so fonts installed later are picked up next boot.
+    """
+    try:
+        with open(FONT_CACHE_FILE, 'r') as f:
+            cached = json.load(f)
+        if cached.get('names') == font_names and all(p and os.path.exists(p) for p in cached['paths'].values()):
+            return cached['paths']
+    except: pass
+    
+    paths = {'regular': None, 'bold': None}
+    for style, bold in (('regular', False), ('bold', True)):
+        for name in font_names:
+            try:
+                path = pygame.font.match_font(name, bold=bold)
+            except: path = None
+            if path:
+                paths[style] = path
+                break
+    if None in paths.values():
+        return paths
+    try:
+        os.makedirs(os.path.dirname(FONT_CACHE_FILE), exist_ok=True)
+        with open(FONT_CACHE_FILE, 'w') as f:
+            json.dump({'names': font_names, 'paths': paths}, f)
+    except: pass
+    return paths
+
 def init_fonts():
     global FONT_TIME, FONT_TEMP, FONT_DATE, FONT_SUB, FONT_TINY, FONT_MED_BOLD, FONT_NEWS, FONT_HEADER
     font_names = ["dejavusans", "freesans", "liberationsans", "arial"]
+    paths = resolve_font_paths(font_names)
     
     def try_load(size, bold=False):
-        for name in font_names:
-            try:
-                f = pygame.font.SysFont(name, size, bold=bold)
-                if f: return SafeFont(f)
-            except: continue
-        return SafeFont(pygame.font.Font(None, size))
+        path = paths['bold'] if bold else paths['regular']
+        try:
+            f = pygame.font.Font(path, size)
+        except:
+            path = None
+            f = pygame.font.Font(None, size)
+        # Same as SysFont: embolden synthetically when no bold face was found
+        synthetic = bold and (path is None or path == paths['regular'])
+        if synthetic:
+            f.set_bold(True)
+        return SafeFont(f, synthetic_bold=synthetic)
 
+    SafeFont.render_cache_size = getattr(config, 'TEXT_CACHE_SIZE', 256)
     FONT_TIME = try_load(145, bold=True) 
+    FONT_TIME.enable_atlas("0123456789:", samples=("07:45", "12:38", "19:09"))
     FONT_TEMP = try_load(95, bold=True)  
     FONT_DATE = try_load(32, bold=True)  
     FONT_SUB = try_load(26, bold=True)  
@@ -90,16 +234,13 @@ def init_fonts():
     FONT_NEWS = try_load(32, bold=False)
     FONT_HEADER = try_load(24, bold=True)
 
-def get_icon(icon_code):
-    url = f"http://openweathermap.org/img/wn/{icon_code}@4x.png"
-    try:
-        r = requests.get(url, timeout=5)
-        r.raise_for_status()
-        return pygame.image.load(BytesIO(r.content))
-    except:
+def get_icon(icon_code, size):
+    """Scaled, display-format icon from the cache (None until downloaded)"""
+    if ICONS is None:
         return None
+    return ICONS.get(icon_code, size)
 
-def draw_weather_slide(weather, date_info, sholat_data, java_date=None):
+def draw_weather_slide(weather, date_info):
     screen.fill(COLOR_BG)
     Y_OFF = 25 # ADJUSTED FOR ROTATION MARGIN
     CENTER_RIGHT = 380 
@@ -114,17 +255,11 @@ def draw_weather_slide(weather, date_info, sholat_data, java_date=None):
         screen.blit(text_city, rect_city)
         
         # Weather icon
-        if 'icon_surface' not in weather:
-             raw_icon = get_icon(weather['icon_code'])
-             if raw_icon:
-                 weather['icon_surface'] = pygame.transform.scale(raw_icon, (120, 120))
-             else:
-                 weather['icon_surface'] = None
-        
-        if weather['icon_surface']:
-            rect_icon = weather['icon_surface'].get_rect()
+        icon = get_icon(weather['icon_code'], 120)
+        if icon:
+            rect_icon = icon.get_rect()
             rect_icon.center = (CENTER_RIGHT, Y_OFF + 90)
-            screen.blit(weather['icon_surface'], rect_icon)
+            screen.blit(icon, rect_icon)
             
         # Temperature (Restore Degree Symbol)
         temp_str = f"{weather['temp']:.0f}\u00B0C" 
@@ -147,10 +282,9 @@ def draw_weather_slide(weather, date_info, sholat_data, java_date=None):
              screen.blit(text_desc, rect_desc)
         else:
              # Try split lines or tiny font
-             import textwrap
-             lines = textwrap.wrap(desc, width=20) # Approx char width
+             lines = text_layout.wrap(desc, FONT_TINY, MAX_W, 2) # Max 2 baris
              y_desc = Y_OFF + 230
-             for line in lines[:2]: # Max 2 baris
+             for line in lines:
                  # Use Tiny Font if split
                  t_rend = FONT_TINY.render(line, True, COLOR_ACCENT)
                  t_rect = t_rend.get_rect(center=(CENTER_RIGHT, y_desc))
@@ -166,13 +300,12 @@ def draw_weather_slide(weather, date_info, sholat_data, java_date=None):
     screen.blit(text_date, (LEFT_MARGIN, Y_OFF + 160))
     
     # Javanese date (big and prominent)
-    java_str = java_date if java_date else date_info['date_javanese']
+    java_str = date_info['date_javanese']
     text_java = FONT_MED_BOLD.render(java_str, True, COLOR_TEXT_MAIN)
     screen.blit(text_java, (LEFT_MARGIN, Y_OFF + 200))
     
     # Hijri date
-    hijri_str = sholat_data.get('hijri_date', date_info['date_hijri']) if sholat_data else date_info['date_hijri']
-    text_hijri = FONT_SUB.render(hijri_str, True, COLOR_ACCENT_2)
+    text_hijri = FONT_SUB.render(date_info['date_hijri'], True, COLOR_ACCENT_2)
     screen.blit(text_hijri, (LEFT_MARGIN, Y_OFF + 255))
 
 def draw_news_slide(news_list, date_info, page=0):
@@ -192,8 +325,8 @@ def draw_news_slide(news_list, date_info, page=0):
     news = news_list[page]
     
     y = 80
-    wrapped_title = textwrap.wrap(news['title'], width=36)
-    for line in wrapped_title[:3]:
+    wrapped_title = text_layout.wrap(news['title'], FONT_SUB, 440, 3)
+    for line in wrapped_title:
         text = FONT_SUB.render(line, True, COLOR_ACCENT_2)
         screen.blit(text, (20, y))
         y += 32
@@ -202,8 +335,8 @@ def draw_news_slide(news_list, date_info, page=0):
     pygame.draw.line(screen, (50, 60, 80), (20, y), (80, y), 2)
     y += 15
     
-    wrapped_desc = textwrap.wrap(news['desc'], width=48)
-    for line in wrapped_desc[:5]:
+    wrapped_desc = text_layout.wrap(news['desc'], FONT_TINY, 440, 5)
+    for line in wrapped_desc:
         text = FONT_TINY.render(line, True, (200, 210, 230))
         screen.blit(text, (20, y))
         y += 26
@@ -211,15 +344,16 @@ def draw_news_slide(news_list, date_info, page=0):
     page_lbl = FONT_TINY.render(f"HALAMAN {page+1}/{len(news_list)}", True, (60, 65, 80))
     screen.blit(page_lbl, (350, 290))
 
+BMKG_TO_OWM = {
+    0: "01d", 1: "02d", 2: "02d", 3: "03d", 4: "04d", 
+    5: "50d", 10: "50d", 45: "50d", 
+    60: "10d", 61: "09d", 63: "09d", 
+    80: "09d", 95: "11d", 97: "11d"
+}
+
 def map_bmkg_to_owm(code):
     """Maps BMKG weather code to OpenWeatherMap icon code"""
-    mapping = {
-        0: "01d", 1: "02d", 2: "02d", 3: "03d", 4: "04d", 
-        5: "50d", 10: "50d", 45: "50d", 
-        60: "10d", 61: "09d", 63: "09d", 
-        80: "09d", 95: "11d", 97: "11d"
-    }
-    return mapping.get(int(code), "03d") # Default to cloudy
+    return BMKG_TO_OWM.get(int(code), "03d") # Default to cloudy
 
 def draw_bmkg_forecast_slide(forecasts, date_info):
     screen.fill(COLOR_BG)
@@ -231,59 +365,42 @@ def draw_bmkg_forecast_slide(forecasts, date_info):
     screen.blit(header_time, (380, Y_OFF))
     pygame.draw.line(screen, (40, 45, 60), (20, Y_OFF + 40), (460, Y_OFF + 40), 2)
     
-    if not forecasts:
+    # Pre-parsed by forecast_store.build(); older snapshots held raw lists
+    if not isinstance(forecasts, dict) or not forecasts.get('time'):
         text = FONT_NEWS.render("Memuat data BMKG...", True, COLOR_TEXT_DIM)
         screen.blit(text, (20, 100))
         return
 
-    display_items = []
-    count = 0 
-    for fc in forecasts:
-        if count >= 3: break
-        dt_str = fc.get('local_datetime', '')
-        if not dt_str: continue
-        display_items.append(fc)
-        count += 1
-        
-    if not display_items: return
-
+    now = forecast_store.local_epoch(date_info['timestamp'])
     col_width = 160
     y_start = 100 # Adjusted for spacing
     
-    for i, fc in enumerate(display_items):
+    for i, idx in enumerate(forecast_store.upcoming(forecasts, now, 3)):
         center_x = (i * col_width) + (col_width // 2)
         
         try:
-            dt_str = fc.get('local_datetime', '')
-            dt_obj = datetime.datetime.strptime(dt_str, "%Y-%m-%d %H:%M:%S")
-            time_str = dt_obj.strftime("%H:%M")
-            date_str = dt_obj.strftime("%d/%m")
-            
-            t_render = FONT_DATE.render(time_str, True, COLOR_TEXT_MAIN)
-            d_render = FONT_TINY.render(date_str, True, COLOR_TEXT_DIM)
+            t_render = FONT_DATE.render(forecasts['hour'][idx], True, COLOR_TEXT_MAIN)
+            d_render = FONT_TINY.render(forecasts['day'][idx], True, COLOR_TEXT_DIM)
             t_rect = t_render.get_rect(center=(center_x, y_start))
             d_rect = d_render.get_rect(center=(center_x, y_start + 30))
             screen.blit(t_render, t_rect)
             screen.blit(d_render, d_rect)
             
-            weather_code = fc.get('weather', 3)
+            weather_code = forecasts['code'][idx]
             owm_code = map_bmkg_to_owm(weather_code)
-            icon = get_icon(owm_code)
+            icon = get_icon(owm_code, 80)
             if icon:
-                icon = pygame.transform.scale(icon, (80, 80))
                 rect = icon.get_rect()
                 rect.center = (center_x, y_start + 90)
                 screen.blit(icon, rect)
             
-            temp = fc.get('t', 0)
+            temp = forecasts['temp'][idx]
             # Restore Degree Symbol
             temp_render = FONT_MED_BOLD.render(f"{temp}\u00B0C", True, COLOR_ACCENT_2)
             temp_rect = temp_render.get_rect(center=(center_x, y_start + 150))
             screen.blit(temp_render, temp_rect)
             
-            desc = safe_str(fc.get('weather_desc', ''))
-            if len(desc) > 15: desc = desc[:13] + ".."
-            desc_render = FONT_TINY.render(desc, True, COLOR_TEXT_MAIN)
+            desc_render = FONT_TINY.render(forecasts['desc'][idx], True, COLOR_TEXT_MAIN)
             desc_rect = desc_render.get_rect(center=(center_x, y_start + 190))
             screen.blit(desc_render, desc_rect)
 
@@ -302,15 +419,15 @@ def draw_bmkg_slide(warning, date_info):
     if not warning: return
 
     y = 80
-    wrapped_head = textwrap.wrap(warning['headline'].upper(), width=32)
-    for line in wrapped_head[:3]:
+    wrapped_head = text_layout.wrap(warning['headline'].upper(), FONT_SUB, 440, 3)
+    for line in wrapped_head:
         text = FONT_SUB.render(line, True, COLOR_DANGER)
         screen.blit(text, (20, y))
         y += 30
         
     y += 15
-    wrapped_desc = textwrap.wrap(warning['desc'], width=48)
-    for line in wrapped_desc[:6]:
+    wrapped_desc = text_layout.wrap(warning['desc'], FONT_TINY, 440, 6)
+    for line in wrapped_desc:
         text = FONT_TINY.render(line, True, COLOR_TEXT_MAIN)
         screen.blit(text, (20, y))
         y += 25
@@ -425,6 +542,14 @@ def draw_finance_slide(data, date_info):
         v_rect.bottomright = (x + box_w - 15, y + box_h - 15)
         screen.blit(v_lbl, v_rect)
         
+        # 24h sparkline (pre-scaled 0..100 by finance_history)
+        spark = d_obj.get('spark') or []
+        if len(spark) > 1:
+            sx, sy, sw, sh = x + 15, y + 38, box_w - 30, 18
+            step = sw / (len(spark) - 1)
+            points = [(sx + int(i * step), sy + sh - (v * sh) // 100) for i, v in enumerate(spark)]
+            pygame.draw.lines(screen, (60, 70, 90), False, points, 1)
+        
         # Trend Arrow
         if change != 0:
             arrow_color = (0, 255, 100) if change > 0 else (255, 50, 50)
@@ -466,23 +591,11 @@ def draw_quote_slide(quote, date_info):
     text = quote.get('text', '')
     author = quote.get('author', 'Unknown')
     
-    # Textwrap manually for large font
-    words = text.split(' ')
-    lines = []
-    current_line = []
-    
-    for word in words:
-        current_line.append(word)
-        test_str = ' '.join(current_line)
-        # Use FONT_NEWS for calculation (same as rendering)
-        if FONT_NEWS.size(test_str)[0] > 440:
-            current_line.pop()
-            lines.append(' '.join(current_line))
-            current_line = [word]
-    lines.append(' '.join(current_line))
+    # Wrap by measured width (cached per quote, not per frame)
+    lines = text_layout.wrap(text, FONT_NEWS, 440, 6) # Max 6 lines
     
     y = 90 # Start higher
-    for line in lines[:6]: # Max 6 lines
+    for line in lines:
         rend = FONT_NEWS.render(line, True, COLOR_TEXT_MAIN)
         screen.blit(rend, (20, y))
         y += 35 # Tighter spacing
@@ -518,6 +631,19 @@ def draw_system_slide(data, date_info):
     lbl = FONT_NEWS.render(f"CPU TEMP: {data.get('temp', 'N/A')}", True, COLOR_ACCENT)
     screen.blit(lbl, (30, y_start + 8))
     
+    # Upstream status (circuit breakers), right side of the CPU row; host
+    # names only when they fit next to the temperature, else a count
+    net_down = data.get('net_down') or []
+    if net_down:
+        free_w = 450 - (30 + lbl.get_width() + 20)
+        text = "OFFLINE: " + ", ".join(short_host(h) for h in net_down)
+        if FONT_TINY.size(text)[0] > free_w:
+            text = f"OFFLINE: {len(net_down)} API"
+        lbl_net = FONT_TINY.render(text, True, (255, 100, 100))
+    else:
+        lbl_net = FONT_TINY.render("API OK", True, (100, 255, 100))
+    screen.blit(lbl_net, (450 - lbl_net.get_width(), y_start + 12))
+    
     # 2. RAM Usage
     y_start += spacing
     ram_total = data.get('ram_total', 1)
@@ -548,18 +674,162 @@ def draw_system_slide(data, date_info):
     lbl_wifi = FONT_SUB.render(f"WiFi: {wifi_ssid}", True, (100, 200, 255))
     screen.blit(lbl_wifi, (30, y_start))
 
+BREAKER_CODES = {"closed": 0, "half_open": 1, "open": 2}
+
+def short_host(host):
+    """api.coingecko.com -> coingecko, for the system slide"""
+    labels = host.split('.')
+    while len(labels) > 2 and labels[0] in ('api', 'www', 'data'):
+        labels.pop(0)
+    return labels[0]
+
 def sanitize_data(data):
-    """Recursively sanitize all strings in data structure"""
-    if isinstance(data, str):
-        return safe_str(data)
-    elif isinstance(data, dict):
-        return {k: sanitize_data(v) for k, v in data.items()}
-    elif isinstance(data, list):
-        return [sanitize_data(item) for item in data]
-    return data
+    """Recursively sanitize all strings in data structure, once at ingest"""
+    return sanitize.clean_data(data)
+
+def fetch_weather():
+    from weather_service import get_weather
+    raw = get_weather(lat=config.LAT, lon=config.LON)
+    return sanitize_data(raw) if raw else None
+
+def fetch_bmkg_forecast():
+    if not hasattr(config, 'LOCATION_ID'):
+        return None
+    import ext_services
+    # Built and cleaned inside the parser, so a 304 costs nothing here
+    return ext_services.get_bmkg_forecast(config.LOCATION_ID) or None
+
+def fetch_finance():
+    import ext_services
+    import finance_history
+    raw = ext_services.get_finance_data()
+    return sanitize_data(finance_history.annotate(raw)) if raw else None
+
+def fetch_system():
+    import ext_services
+    raw = ext_services.get_system_info()
+    return sanitize_data(raw) if raw else None
+
+def fetch_quote():
+    import ext_services
+    raw = ext_services.get_random_quote()
+    return sanitize_data(raw) if raw else None
+
+def fetch_news():
+    import ext_services
+    # Items are cleaned once when first seen (news_store)
+    return ext_services.get_google_news() or None
+
+def fetch_sholat():
+    # Computed locally; the first call builds this year's table
+    import prayer_times
+    return prayer_times.get_times()
+
+def fetch_bmkg_warning():
+    import ext_services
+    # Cleaned by the feed parser; None clears the warning
+    return ext_services.get_bmkg_warning(config.BMKG_PROVINCE) or None
+
+# Slide type -> (config attribute, default seconds)
+SLIDE_DURATIONS = {
+    "weather": ("SLIDE_DURATION_WEATHER", 15),
+    "news": ("SLIDE_DURATION_NEWS", 10),
+    "sholat": ("SLIDE_DURATION_SHOLAT", 10),
+    "bmkg": ("SLIDE_DURATION_BMKG", 6),
+    "bmkg_forecast": ("SLIDE_DURATION_BMKG", 5),
+    "finance": ("SLIDE_DURATION_FINANCE", 10),
+    "quote": ("SLIDE_DURATION_QUOTE", 10),
+    "system": ("SLIDE_DURATION_SYSTEM", 8),
+}
+
+def get_slide_duration(s_type):
+    attr, default = SLIDE_DURATIONS.get(s_type, ("SLIDE_DURATION_WEATHER", 10))
+    # Convert to int in case it's a string from config
+    try:
+        return int(getattr(config, attr, default))
+    except (ValueError, TypeError):
+        return 10  # Default fallback
+
+# Slide type -> store keys it renders from (part of the slide cache key)
+SLIDE_SOURCES = {
+    "weather": ("weather",),
+    "bmkg_forecast": ("bmkg_forecast",),
+    "news": ("news",),
+    "sholat": ("sholat",),
+    "bmkg": ("bmkg_warning",),
+    "finance": ("finance",),
+    "quote": ("quote",),
+    "system": ("system",),
+}
+
+# Sources persisted across reboots (quote/system are local and cheap to redo)
+SNAPSHOT_KEYS = ("weather", "bmkg_forecast", "finance", "news", "sholat", "bmkg_warning")
+
+def draw_stale_marker(ages):
+    """Small amber dot + age in the top margin when a slide shows stale data"""
+    age = max(ages)
+    if age >= 3600:
+        age_str = f"{int(age // 3600)}j"
+    else:
+        age_str = f"{int(age // 60)}m"
+    lbl = FONT_TINY.render(age_str, True, COLOR_ACCENT_2)
+    rect = lbl.get_rect()
+    rect.topright = (458, 0)
+    pygame.draw.rect(screen, COLOR_BG, rect)
+    screen.blit(lbl, rect)
+    pygame.draw.circle(screen, COLOR_ACCENT_2, (470, 11), 5)
+
+def get_uptime():
+    with open('/proc/uptime', 'r') as f:
+        return float(f.readline().split()[0])
+
+def network_watchdog(state):
+    """
+    Robust Internet Watchdog. Runs on a fetch worker every 5 mins.
+    Tolerance: 10 failures (50 mins) before reboot
+    Auto WiFi reconnect attempt before giving up
+    """
+    try:
+        # Ping Google DNS with 3 sec timeout
+        res = os.system("ping -c 1 -W 3 8.8.8.8 > /dev/null 2>&1")
+        if res != 0:
+            state['fail'] += 1
+            print(f"Network Check Failed! Attempt {state['fail']}/10")
+            
+            # Try WiFi reconnect at 5th failure (before reboot threshold)
+            if state['fail'] == 5:
+                print("Attempting WiFi reconnect...")
+                os.system("sudo wpa_cli -i wlan0 reconfigure")
+                time.sleep(10)  # Wait for reconnect
+        else:
+            # Success! Reset counter
+            if state['fail'] > 0:
+                print("Network restored!")
+            state['fail'] = 0
+        
+        # Reboot only after 10 consecutive failures (50 mins)
+        if state['fail'] >= 10:
+            print("Persistent Network Failure. Rebooting...")
+            with open("/home/pi/weather/debug.log", "a") as f:
+                f.write(f"{time.ctime()}: Network Watchdog Reboot (10 failures)\n")
+            os.system("sudo reboot")
+    except Exception as e:
+        print(f"Watchdog error: {e}")
+    return None
+
+def seconds_to_next_minute():
+    now = time.time()
+    return 60 - (now % 60) + 0.05
+
+def seconds_to_local_midnight():
+    now = time.time() + getattr(config, 'TIMEZONE_OFFSET', 25200)
+    return 86400 - (now % 86400) + 1
 
 def main():
-    global screen
+    global screen, ICONS
+    fetcher = None
+    fb_out = None
+    store = None
     try:
         # Force reload config to pick up changes from dashboard
         importlib.reload(config)
@@ -568,284 +838,385 @@ def main():
             f.write(f"\n=== STARTUP {datetime.datetime.now()} ===\n")
             f.write(f"Location: {config.LOCATION_NAME}\n")
             f.write(f"Coords: {config.LAT}, {config.LON}\n")
+        boot_profile.mark("config")
+        
+        # Optional direct framebuffer backend (config.DISPLAY_BACKEND = "fb")
+        if getattr(config, 'DISPLAY_BACKEND', 'fbcon') == "fb":
+            try:
+                import fb_output
+                fb_out = fb_output.FramebufferOutput(config.FB_PATH, rotate=config.ROTATE_ANGLE)
+                # SDL only provides fonts/surfaces now; we write the panel ourselves
+                os.environ["SDL_VIDEODRIVER"] = "dummy"
+            except Exception as e:
+                with open("/home/pi/weather/debug.log", "a") as f:
+                    f.write(f"FB backend unavailable, using fbcon: {e}\n")
         
         pygame.display.init()
         pygame.font.init()
         
         # KEY CHANGE: Real Screen vs Virtual Screen
-        try:
-            real_screen = pygame.display.set_mode((480, 320), pygame.FULLSCREEN, 16)
-        except:
-            real_screen = pygame.display.set_mode((480, 320), pygame.FULLSCREEN, 24)
+        if fb_out:
+            real_screen = pygame.display.set_mode((480, 320))
+        else:
+            try:
+                real_screen = pygame.display.set_mode((480, 320), pygame.FULLSCREEN, 16)
+            except:
+                real_screen = pygame.display.set_mode((480, 320), pygame.FULLSCREEN, 24)
             
         # Virtual Canvas for Drawing elements (This is what global 'screen' points to)
-        screen = pygame.Surface((480, 320))
+        # The fb backend reads it through surfarray, which needs 24/32 bit pixels
+        screen = pygame.Surface((480, 320), 0, 32) if fb_out else pygame.Surface((480, 320))
         
         pygame.mouse.set_visible(False)
+        boot_profile.mark("display")
         init_fonts()
+        boot_profile.mark("fonts")
         
-        last_weather_upd = 0
-        last_news_upd = 0
-        last_sholat_upd = 0
-        last_java_upd = 0
-        last_bmkg_upd = 0
-        last_bmkg_forecast_upd = 0
-        last_finance_upd = 0
-        last_system_upd = 0
-        last_quote_upd = 0
-        
-        weather_data = None
-        news_pool = []
-        news_display = []
-        sholat_data = None
-        java_date = None
-        bmkg_warning = None
-        bmkg_forecast = None
-        finance_data = None
-        system_data = None
-        quote_data = None
+        # Everything below is driven by timed events: the loop sleeps until
+        # the next deadline or until a fetch worker wakes it with new data.
+        sched = Scheduler()
+        redraw = {'needed': True}
+        
+        def on_data(key):
+            redraw['needed'] = True
+            sched.wake()
+        
+        # All network I/O runs on the fetch pool; the loop only reads the store
+        store = fetcher_mod.DataStore()
+        store.on_change = on_data
+        fetcher = fetcher_mod.FetchExecutor(store, max_workers=getattr(config, 'FETCH_WORKERS', 3))
+        retry = getattr(config, 'FETCH_RETRY_INTERVAL', 30)
+        stale_factor = getattr(config, 'STALE_FACTOR', 2)
+        
+        # Last known state: render stale-but-marked data until fetches land
+        restored = snapshot.load(store)
+        with open("/home/pi/weather/debug.log", "a") as f:
+            f.write(f"Snapshot: restored {restored} sources\n")
+        boot_profile.mark("snapshot")
+        
+        ICONS = IconCache()
+        
+        def add_refresh(key, func, interval, retry_delay=retry, allow_none=False, delay=0, max_interval=None):
+            """
+            Periodic refresh job for one source. Submits the fetch and
+            re-arms after `interval`, or after `retry_delay` while the
+            source still has no data. With max_interval, the upstream's
+            expiry hint (Cache-Control/Expires or a payload timestamp, see
+            fetcher.hint_expires) may stretch the wait up to max_interval.
+            """
+            # Elapsed time is monotonic; wall time is only compared with the
+            # (wall clock) expiry hint
+            state = {'last': None, 'last_wall': 0}
+            max_interval = max(interval, max_interval or interval)
+            store.set_ttl(key, max_interval * stale_factor)
+            def job():
+                now = time.monotonic()
+                has_data = store.version(key) > 0 and (store.get(key) is not None or allow_none)
+                wait = interval
+                expires = store.expires(key)
+                if expires and expires > state['last_wall']:
+                    wait = min(max(expires - state['last_wall'], interval), max_interval)
+                if has_data and state['last'] is not None and now - state['last'] < wait:
+                    return wait - (now - state['last'])
+                if fetcher.submit(key, func, allow_none=allow_none):
+                    state['last'], state['last_wall'] = now, time.time()
+                return interval if has_data else retry_delay
+            sched.add(f"refresh:{key}", job, delay=delay)
+        
+        # Sholat times are computed locally: at start, then whenever the local
+        # date changes. Checked at least hourly, since an NTP sync after boot
+        # can move the wall clock (and midnight) by hours.
+        store.set_ttl('sholat', 86400 * stale_factor)
+        sholat_state = {'date': None}
+        def sholat_job():
+            today = date_utils.local_now().date()
+            if store.version('sholat') == 0 or today != sholat_state['date']:
+                if fetcher.submit('sholat', fetch_sholat):
+                    sholat_state['date'] = today
+            if store.version('sholat') == 0:
+                return retry
+            return min(seconds_to_local_midnight(), 3600)
+        
+        def icon_task(func, *args):
+            """Run an icon download and wake the loop if it added an icon"""
+            before = ICONS.version
+            func(*args)
+            if ICONS.version != before:
+                sched.wake()
+        
+        def start_fetching():
+            """Called once the first frame is on screen, so boot never waits on the network"""
+            # Icons: warm the disk tier with every code a slide can ask for
+            fetcher.run('icons', icon_task, ICONS.prefetch, set(BMKG_TO_OWM.values()) | {"03d"})
+            calendar_days = getattr(config, 'CALENDAR_PRECOMPUTE_DAYS', 0)
+            if calendar_days:
+                fetcher.run('calendar', date_utils.precompute, date_utils.local_now().date(), calendar_days)
+            add_refresh('weather', fetch_weather, config.REFRESH_INTERVAL,
+                        max_interval=getattr(config, 'REFRESH_MAX_INTERVAL', None))
+            add_refresh('bmkg_forecast', fetch_bmkg_forecast, getattr(config, 'BMKG_FORECAST_INTERVAL', 1800),
+                        max_interval=getattr(config, 'BMKG_FORECAST_MAX_INTERVAL', None))
+            add_refresh('finance', fetch_finance, getattr(config, 'FINANCE_INTERVAL', 900),
+                        max_interval=getattr(config, 'FINANCE_MAX_INTERVAL', None))
+            add_refresh('system', fetch_system, 10, retry_delay=5)  # Every 10s, retry every 5s if fail
+            add_refresh('quote', fetch_quote, 45, retry_delay=30)  # New quote each cycle
+            add_refresh('news', fetch_news, config.NEWS_INTERVAL,
+                        max_interval=getattr(config, 'NEWS_MAX_INTERVAL', None))
+            sched.add('refresh:sholat', sholat_job, delay=0)
+            # None clears an expired warning
+            add_refresh('bmkg_warning', fetch_bmkg_warning, config.BMKG_INTERVAL, retry_delay=config.BMKG_INTERVAL, allow_none=True,
+                        max_interval=getattr(config, 'BMKG_MAX_INTERVAL', None))
+        
+        # Download icons requested by a slide but not on disk yet
+        def icon_job():
+            if ICONS.missing:
+                fetcher.run('icons', icon_task, ICONS.download_missing)
+            return None
+        sched.add('icons', icon_job, delay=retry, interval=retry)
+        
+        # Persist the snapshot when any source changed since the last save
+        saved = {'versions': None}
+        def snapshot_job():
+            versions = tuple(store.version(k) for k in SNAPSHOT_KEYS)
+            if versions != saved['versions']:
+                snapshot.save(store, SNAPSHOT_KEYS)
+                saved['versions'] = versions
+            return None
+        snap_interval = getattr(config, 'SNAPSHOT_INTERVAL', 300)
+        sched.add('snapshot', snapshot_job, delay=snap_interval, interval=snap_interval)
+        
+        # Network watchdog: 2 min grace period after boot, then every 5 mins
+        net_state = {'fail': 0}
+        def watchdog_job():
+            fetcher.run('watchdog', network_watchdog, net_state)
+            return None
+        sched.add('watchdog', watchdog_job, delay=120, interval=300)
+        
+        # Auto Reboot: one deadline computed from uptime at startup
+        # Use getattr with default 0 to avoid crash if config not updated yet
+        reboot_hours = getattr(config, 'AUTO_REBOOT_HOURS', 0)
+        # Convert to int in case it's a string from config
+        try:
+            reboot_hours = int(reboot_hours)
+        except (ValueError, TypeError):
+            reboot_hours = 0
+        if reboot_hours > 0:
+            try:
+                # Convert Hours to Seconds (3600)
+                remaining = reboot_hours * 3600 - get_uptime()
+                def reboot_job():
+                    print("AUTO REBOOT TRIGGERED")
+                    os.system("sudo reboot")
+                    return None
+                sched.add('reboot', reboot_job, delay=max(0, remaining))
+            except: pass
+        
+        # Clock digits only change on the minute
+        def minute_job():
+            redraw['needed'] = True
+            return seconds_to_next_minute()
+        sched.add('minute', minute_job, delay=seconds_to_next_minute())
         
         slides = ["weather", "bmkg_forecast", "news", "finance", "sholat", "quote", "system"]
-        current_slide_idx = 0
-        news_page_idx = 0
-        last_net_check = 0
-        net_fail_count = 0
-        boot_time = time.time()  # Track when system started
-        slide_start_time = time.time()
+        view = {'slide_idx': 0, 'news_page': 0, 'news_display': [], 'news_sample': 0, 'news_shown': set()}
+        
+        def resample_news():
+            """NEWS_LIMIT items: never-shown ones first (pool is newest first), topped up at random"""
+            news_pool = store.get('news') or []
+            if news_pool:
+                shown = view['news_shown']
+                shown.intersection_update(item.get('id') for item in news_pool)
+                picked = [item for item in news_pool if item.get('id') not in shown][:config.NEWS_LIMIT]
+                if len(picked) < config.NEWS_LIMIT:
+                    rest = [item for item in news_pool if item.get('id') in shown]
+                    picked += random.sample(rest, min(len(rest), config.NEWS_LIMIT - len(picked)))
+                view['news_display'] = picked
+                view['news_sample'] += 1
+        
+        # Slide transition
+        def slide_job():
+            news_display = view['news_display']
+            if slides[view['slide_idx']] == "news" and news_display and view['news_page'] < len(news_display) - 1:
+                view['news_page'] += 1
+            else:
+                view['news_page'] = 0
+                view['slide_idx'] = (view['slide_idx'] + 1) % len(slides)
+                if slides[view['slide_idx']] == "news":
+                    resample_news()
+            redraw['needed'] = True
+            return get_slide_duration(slides[view['slide_idx']])
+        sched.add('slide', slide_job, delay=get_slide_duration(slides[0]))
+        
+        news_ver = 0
+        bmkg_ver = 0
+        differ = FrameDiffer()
+        slide_cache = SlideCache(max_items=getattr(config, 'SLIDE_CACHE_SIZE', 8))
+        icon_ver = ICONS.version
+        
+        def cache_stats_job():
+            with open("/home/pi/weather/debug.log", "a") as f:
+                f.write(f"{time.ctime()}: Slide cache hits={slide_cache.hits} misses={slide_cache.misses} ({slide_cache.hit_rate():.0%})\n")
+                f.write(f"{time.ctime()}: Text cache hits={SafeFont.hits} misses={SafeFont.misses}\n")
+            return None
+        sched.add('cache_stats', cache_stats_job, delay=3600, interval=3600)
+        
+        # Export metrics for app.py's /api/metrics
+        def metrics_job():
+            reg = metrics.REGISTRY
+            for name, obj in (("slide", slide_cache), ("icon", ICONS), ("text", SafeFont)):
+                reg.set_counter("cache_hits_total", obj.hits, cache=name)
+                reg.set_counter("cache_misses_total", obj.misses, cache=name)
+            reg.set_counter("frames_total", differ.frames_skipped, outcome="skipped")
+            reg.set_counter("frames_total", differ.frames_partial, outcome="partial")
+            reg.set_counter("frames_total", differ.frames_full, outcome="full")
+            import http_client
+            http = http_client.stats()
+            reg.set_counter("http_retries_total", http["retries"])
+            reg.set_counter("http_not_modified_total", http["not_modified"])
+            for host, h in http["hosts"].items():
+                reg.set_counter("http_requests_total", h["requests"], host=host)
+                reg.set_counter("http_connections_total", h["connections"], host=host)
+                reg.set_counter("http_reused_total", h["reused"], host=host)
+            for host, b in http_client.breakers().items():
+                reg.set("http_breaker_state", BREAKER_CODES.get(b["state"], 0), host=host)
+            reg.write()
+            return None
+        metrics_interval = getattr(config, 'METRICS_INTERVAL', 30)
+        sched.add('metrics', metrics_job, delay=metrics_interval, interval=metrics_interval)
+        
+        fetch_started = False
         
         running = True
         while running:
             pygame.event.pump()
-            curr = time.time()
-            date_info = date_utils.get_full_date_info()
-
-            # Update weather
-            if curr - last_weather_upd > config.REFRESH_INTERVAL or weather_data is None:
-                try:
-                    raw_weather = get_weather(lat=config.LAT, lon=config.LON)
-                    weather_data = sanitize_data(raw_weather) if raw_weather else None
-                    if weather_data and 'icon_surface' in weather_data: 
-                        del weather_data['icon_surface']
-                    last_weather_upd = curr
-                except Exception as e:
-                    with open("/home/pi/weather/debug.log", "a") as f:
-                        f.write(f"Weather error: {e}\n")
+            metrics.REGISTRY.inc("loop_wakeups_total")
             
-            # Update BMKG Forecast
-            if curr - last_bmkg_forecast_upd > 1800 or bmkg_forecast is None:
-                try:
-                    if hasattr(config, 'LOCATION_ID'):
-                       raw_fc = ext_services.get_bmkg_forecast(config.LOCATION_ID)
-                       bmkg_forecast = sanitize_data(raw_fc) if raw_fc else None
-                    last_bmkg_forecast_upd = curr
-                except Exception as e:
-                     with open("/home/pi/weather/debug.log", "a") as f:
-                        f.write(f"BMKG Forecast error: {e}\n")
+            # First frame is out: log boot-to-first-pixel, then start fetching
+            if not fetch_started and differ.frames_full:
+                fetch_started = True
+                boot_profile.mark("first_frame")
+                with open("/home/pi/weather/debug.log", "a") as f:
+                    f.write(boot_profile.summary() + "\n")
+                start_fetching()
+            
+            sched.run_pending()
 
-            # Update Finance (Every 15 mins)
-            if curr - last_finance_upd > 900 or finance_data is None:
-                try:
-                    raw_fin = ext_services.get_finance_data()
-                    finance_data = sanitize_data(raw_fin) if raw_fin else None
-                    last_finance_upd = curr
-                except Exception as e:
-                     with open("/home/pi/weather/debug.log", "a") as f:
-                        f.write(f"Finance error: {e}\n")
-
-            # Robust Internet Watchdog (Every 5 mins)
-            # Grace period: Wait 2 mins after boot before checking
-            # Tolerance: 10 failures (50 mins) before reboot
-            # Auto WiFi reconnect attempt before giving up
-            if curr - boot_time > 120:  # Grace period: 2 minutes after boot
-                if curr - last_net_check > 300:  # Check every 5 minutes
-                    last_net_check = curr
-                    try:
-                        # Ping Google DNS with 3 sec timeout
-                        res = os.system("ping -c 1 -W 3 8.8.8.8 > /dev/null 2>&1")
-                        if res != 0:
-                            net_fail_count += 1
-                            print(f"Network Check Failed! Attempt {net_fail_count}/10")
-                            
-                            # Try WiFi reconnect at 5th failure (before reboot threshold)
-                            if net_fail_count == 5:
-                                print("Attempting WiFi reconnect...")
-                                os.system("sudo wpa_cli -i wlan0 reconfigure")
-                                time.sleep(10)  # Wait for reconnect
-                        else:
-                            # Success! Reset counter
-                            if net_fail_count > 0:
-                                print("Network restored!")
-                            net_fail_count = 0 
-                        
-                        # Reboot only after 10 consecutive failures (50 mins)
-                        if net_fail_count >= 10:
-                            print("Persistent Network Failure. Rebooting...")
-                            with open("/home/pi/weather/debug.log", "a") as f:
-                                f.write(f"{time.ctime()}: Network Watchdog Reboot (10 failures)\n")
-                            import os
-                            os.system("sudo reboot")
-                    except Exception as e:
-                        print(f"Watchdog error: {e}")
-
-
-            # Update System Info (Every 10s)
-            # Retry every 5s if fail
-            if (curr - last_system_upd > 10) or (system_data is None and curr - last_system_upd > 5):
-                try:
-                    raw_sys = ext_services.get_system_info()
-                    if raw_sys:
-                         system_data = sanitize_data(raw_sys)
-                    last_system_upd = curr
-                except: pass
-
-            # Update Quote (Every 45 seconds - New quote each cycle)
-            if (curr - last_quote_upd > 45) or (quote_data is None and curr - last_quote_upd > 30):
-                try:
-                    raw_quote = ext_services.get_random_quote()
-                    if raw_quote:
-                         quote_data = sanitize_data(raw_quote)
-                    last_quote_upd = curr
-                except: pass
-
-            # Update news
-            if curr - last_news_upd > config.NEWS_INTERVAL or not news_pool:
-                try:
-                    raw_news = ext_services.get_google_news()
-                    news_pool = sanitize_data(raw_news) if raw_news else []
-                    if news_pool:
-                        news_display = random.sample(news_pool, min(len(news_pool), config.NEWS_LIMIT))
-                    last_news_upd = curr
-                except Exception as e:
-                    with open("/home/pi/weather/debug.log", "a") as f:
-                        f.write(f"News error: {e}\n")
+            # Fresh news pool landed: resample the pages shown
+            if store.version('news') != news_ver:
+                news_ver = store.version('news')
+                resample_news()
+                view['news_page'] = min(view['news_page'], max(0, len(view['news_display']) - 1))
 
-            # Update sholat
-            if curr - last_sholat_upd > config.SHOLAT_INTERVAL or sholat_data is None:
-                try:
-                    raw_sholat = ext_services.get_sholat_times(lat=config.LAT, lon=config.LON)
-                    sholat_data = sanitize_data(raw_sholat) if raw_sholat else None
-                    last_sholat_upd = curr
-                except Exception as e:
-                    with open("/home/pi/weather/debug.log", "a") as f:
-                        f.write(f"Sholat error: {e}\n")
+            # Fresh BMKG warning landed: toggle its slide
+            if store.version('bmkg_warning') != bmkg_ver:
+                bmkg_ver = store.version('bmkg_warning')
+                bmkg_warning = store.get('bmkg_warning')
+                curr_type = slides[view['slide_idx']]
+                if bmkg_warning and "bmkg" not in slides:
+                    slides.insert(1, "bmkg")
+                elif not bmkg_warning and "bmkg" in slides:
+                    slides.remove("bmkg")
+                # Stay on the slide that was showing
+                if curr_type in slides:
+                    view['slide_idx'] = slides.index(curr_type)
+                else:
+                    view['slide_idx'] = view['slide_idx'] % len(slides)
 
-            # Update javanese
-            if curr - last_java_upd > 21600 or java_date is None: 
-                try:
-                    raw_java = ext_services.get_javanese_date()
-                    java_date = safe_str(raw_java) if raw_java else None
-                    last_java_upd = curr
-                except: pass
+            # A newly downloaded icon can complete slides drawn without it
+            if ICONS.version != icon_ver:
+                icon_ver = ICONS.version
+                redraw['needed'] = True
 
-            # Update BMKG Warning
-            if curr - last_bmkg_upd > config.BMKG_INTERVAL:
-                try:
-                    raw_bmkg = ext_services.get_bmkg_warning(config.BMKG_PROVINCE)
-                    bmkg_warning = sanitize_data(raw_bmkg) if raw_bmkg else None
-                    last_bmkg_upd = curr
-                    if bmkg_warning and "bmkg" not in slides:
-                        slides.insert(1, "bmkg")
-                    elif not bmkg_warning and "bmkg" in slides:
-                        slides.remove("bmkg")
-                except: pass
+            if not redraw['needed']:
+                sched.wait()
+                continue
+            redraw['needed'] = False
             
-            # Slide duration logic
-            slide_duration = config.SLIDE_DURATION_WEATHER
-            s_type = slides[current_slide_idx]
+            date_info = date_utils.get_full_date_info()
+            weather_data = store.get('weather')
+            sholat_data = store.get('sholat')
             
-            if s_type == "news": slide_duration = config.SLIDE_DURATION_NEWS
-            elif s_type == "sholat": slide_duration = config.SLIDE_DURATION_SHOLAT
-            elif s_type == "bmkg": slide_duration = config.SLIDE_DURATION_BMKG
-            elif s_type == "bmkg_forecast": slide_duration = getattr(config, 'SLIDE_DURATION_BMKG', 5)
-            elif s_type == "finance": slide_duration = getattr(config, 'SLIDE_DURATION_FINANCE', 10)
-            elif s_type == "quote": slide_duration = getattr(config, 'SLIDE_DURATION_QUOTE', 10)
-            elif s_type == "system": slide_duration = getattr(config, 'SLIDE_DURATION_SYSTEM', 8)
-
-            # Convert to int in case it's a string from config
-            try:
-                slide_duration = int(slide_duration)
-            except (ValueError, TypeError):
-                slide_duration = 10  # Default fallback
-
-            # Slide transition
-            if curr - slide_start_time > slide_duration:
-                if slides[current_slide_idx] == "news" and news_display:
-                    if news_page_idx < len(news_display) - 1:
-                        news_page_idx += 1
-                        slide_start_time = curr
-                    else:
-                        news_page_idx = 0
-                        current_slide_idx = (current_slide_idx + 1) % len(slides)
-                        slide_start_time = curr
-                        if slides[current_slide_idx] == "news" and news_pool:
-                            news_display = random.sample(news_pool, min(len(news_pool), config.NEWS_LIMIT))
-                else:
-                    current_slide_idx = (current_slide_idx + 1) % len(slides)
-                    slide_start_time = curr
-                    if slides[current_slide_idx] == "news" and news_pool:
-                        news_display = random.sample(news_pool, min(len(news_pool), config.NEWS_LIMIT))
-
-            # Auto Reboot Logic (Once per loop is fine, low overhead)
-            # Use getattr with default 0 to avoid crash if config not updated yet
-            reboot_hours = getattr(config, 'AUTO_REBOOT_HOURS', 0)
-            # Convert to int in case it's a string from config
-            try:
-                reboot_hours = int(reboot_hours)
-            except (ValueError, TypeError):
-                reboot_hours = 0
-            if reboot_hours > 0:
+            # Draw current slide to Virtual Screen, or reuse a cached render
+            s_type = slides[view['slide_idx']]
+            versions = tuple(store.version(k) for k in SLIDE_SOURCES.get(s_type, ()))
+            page = (view['news_sample'], view['news_page']) if s_type == "news" else 0
+            if s_type in ("weather", "bmkg_forecast"):
+                versions += (icon_ver,)
+            cache_key = (s_type, versions, page, date_info['time'])
+            cached = slide_cache.get(cache_key)
+            
+            if cached is not None:
+                screen.blit(cached, (0, 0))
+            else:
+                screen.fill(COLOR_BG)
+                t_draw = time.perf_counter()
                 try:
-                    with open('/proc/uptime', 'r') as f:
-                        uptime_seconds = float(f.readline().split()[0])
-                    
-                    # Convert Hours to Seconds (3600)
-                    limit_seconds = reboot_hours * 3600
-                    if uptime_seconds > limit_seconds:
-                        print("AUTO REBOOT TRIGGERED")
-                        import os
-                        os.system("sudo reboot")
-                except: pass
+                    if s_type == "weather":
+                        draw_weather_slide(weather_data, date_info)
+                    elif s_type == "bmkg_forecast":
+                        draw_bmkg_forecast_slide(store.get('bmkg_forecast'), date_info)
+                    elif s_type == "news":
+                        draw_news_slide(view['news_display'], date_info, view['news_page'])
+                        if view['news_display']:
+                            view['news_shown'].add(view['news_display'][view['news_page']].get('id'))
+                    elif s_type == "sholat":
+                        draw_sholat_slide(sholat_data, date_info, config.LOCATION_NAME or "Indonesia")
+                    elif s_type == "bmkg":
+                        draw_bmkg_slide(store.get('bmkg_warning'), date_info)
+                    elif s_type == "finance":
+                        draw_finance_slide(store.get('finance'), date_info)
+                    elif s_type == "system":
+                        draw_system_slide(store.get('system'), date_info)
+                    elif s_type == "quote":
+                        draw_quote_slide(store.get('quote'), date_info)
+                    slide_cache.put(cache_key, screen)
+                    metrics.REGISTRY.observe("draw_seconds", time.perf_counter() - t_draw, slide=s_type)
+                except Exception as e:
+                    with open("/home/pi/weather/debug.log", "a") as f:
+                        f.write(f"Draw error ({s_type}): {e}\n")
             
-            # Draw current slide to Virtual Screen
-            screen.fill(COLOR_BG)
-            s_type = slides[current_slide_idx]
+            # Mark slides showing data older than its TTL (e.g. network down)
+            now = time.time()
+            stale_ages = [now - store.updated_at(k) for k in SLIDE_SOURCES.get(s_type, ()) if store.is_stale(k, now)]
+            if stale_ages:
+                draw_stale_marker(stale_ages)
             
-            try:
-                if s_type == "weather":
-                    draw_weather_slide(weather_data, date_info, sholat_data, java_date)
-                elif s_type == "bmkg_forecast":
-                    draw_bmkg_forecast_slide(bmkg_forecast, date_info)
-                elif s_type == "news":
-                    draw_news_slide(news_display, date_info, news_page_idx)
-                elif s_type == "sholat":
-                    draw_sholat_slide(sholat_data, date_info, config.LOCATION_NAME or "Indonesia")
-                elif s_type == "bmkg":
-                    draw_bmkg_slide(bmkg_warning, date_info)
-                elif s_type == "finance":
-                    draw_finance_slide(finance_data, date_info)
-                elif s_type == "system":
-                    draw_system_slide(system_data, date_info)
-                elif s_type == "quote":
-                    draw_quote_slide(quote_data, date_info)
-            except Exception as e:
-                with open("/home/pi/weather/debug.log", "a") as f:
-                    f.write(f"Draw error ({s_type}): {e}\n")
+            if fb_out:
+                # Frame hash first: unchanged frames skip the conversion too
+                if differ.diff(screen) is not None:
+                    t_flip = time.perf_counter()
+                    fb_out.push(screen)
+                    metrics.REGISTRY.observe("flip_seconds", time.perf_counter() - t_flip)
+                continue
             
             # ROTATION: Use config.ROTATE_ANGLE
             if config.ROTATE_ANGLE > 0:
                 rotated_surface = pygame.transform.rotate(screen, config.ROTATE_ANGLE)
             else:
                 rotated_surface = screen
-            real_screen.blit(rotated_surface, (0, 0))
 
-            pygame.display.flip()
-            time.sleep(0.1)
+            # Push only the rows that changed over SPI; identical frames cost nothing
+            rects = differ.diff(rotated_surface)
+            if rects is None:
+                continue
+            t_flip = time.perf_counter()
+            real_screen.blit(rotated_surface, (0, 0))
+            if len(rects) == 1 and rects[0].size == rotated_surface.get_size():
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+            metrics.REGISTRY.observe("flip_seconds", time.perf_counter() - t_flip)
             
     except Exception as e:
         with open("/home/pi/weather/fatal_error.txt", "w") as f:
             import traceback
             f.write(f"{e}\n{traceback.format_exc()}")
     finally:
+        if store:
+            snapshot.save(store, SNAPSHOT_KEYS)
+        if fetcher:
+            fetcher.shutdown()
+        if fb_out:
+            fb_out.close()
         pygame.quit()
 
 if __name__ == "__main__":
@@ -0,0 +1,146 @@
+import os
+import json
+import time
+import threading
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+METRICS_FILE = os.path.join(APP_DIR, "cache", "metrics.json")
+
+PREFIX = "weatherpi_"
+# Seconds; covers a cached blit (~1 ms) up to a timed-out fetch (10 s)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    "fetch_seconds": "Upstream fetch latency per source",
+    "fetch_errors_total": "Failed fetches per source",
+    "draw_seconds": "Slide render time (cache misses only)",
+    "flip_seconds": "Time to push a frame to the panel",
+    "loop_wakeups_total": "Render loop wake-ups",
+    "frames_total": "Frames by outcome (skipped/partial/full)",
+    "cache_hits_total": "Cache hits per cache",
+    "cache_misses_total": "Cache misses per cache",
+    "http_requests_total": "HTTP requests sent per host",
+    "http_connections_total": "New connections (TCP/TLS handshakes) per host",
+    "http_reused_total": "Requests served on a kept-alive connection per host",
+    "http_retries_total": "HTTP attempts that were retries",
+    "http_not_modified_total": "Conditional requests answered with 304",
+    "http_breaker_state": "Circuit breaker per host (0 closed, 1 half-open, 2 open)",
+    "metrics_age_seconds": "Seconds since main.py last wrote the metrics file",
+}
+
+class Metrics:
+    """
+    Minimal thread-safe counters, gauges and histograms.
+    main.py records into REGISTRY and periodically write()s a JSON snapshot
+    that app.py renders at /api/metrics in Prometheus text format.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._hists = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return (name, tuple(sorted(labels.items())))
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_counter(self, name, value, **labels):
+        """Mirror a counter kept elsewhere (e.g. SlideCache.hits)."""
+        with self._lock:
+            self._counters[self._key(name, labels)] = value
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self._gauges[self._key(name, labels)] = value
+
+    def observe(self, name, seconds, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            hist = self._hists.get(key)
+            if hist is None:
+                hist = self._hists[key] = {"buckets": [0] * len(BUCKETS), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    hist["buckets"][i] += 1
+                    break
+            hist["sum"] += seconds
+            hist["count"] += 1
+
+    def snapshot(self):
+        def dump(d):
+            return [{"name": k[0], "labels": dict(k[1]), "value": v} for k, v in d.items()]
+        with self._lock:
+            return {
+                "time": time.time(),
+                "counters": dump(self._counters),
+                "gauges": dump(self._gauges),
+                "histograms": [{"name": k[0], "labels": dict(k[1]), "buckets": list(v["buckets"]),
+                                "sum": v["sum"], "count": v["count"]} for k, v in self._hists.items()],
+            }
+
+    def write(self, path=METRICS_FILE):
+        """Atomically replace the shared metrics file."""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.snapshot(), f, separators=(",", ":"))
+            os.replace(tmp, path)
+        except Exception as e:
+            print(f"Metrics write error: {e}")
+
+REGISTRY = Metrics()
+
+def read(path=METRICS_FILE):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+def _labels(labels, extra=None):
+    items = sorted(labels.items())
+    if extra:
+        items.append(extra)
+    if not items:
+        return ""
+    body = ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in items)
+    return "{" + body + "}"
+
+def render_prometheus(snap):
+    """Prometheus text exposition format (version 0.0.4) for a snapshot."""
+    lines = []
+    typed = set()
+
+    def header(name, kind):
+        if name not in typed:
+            typed.add(name)
+            if name in HELP:
+                lines.append(f"# HELP {PREFIX}{name} {HELP[name]}")
+            lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+    for item in sorted(snap.get("counters", []), key=lambda i: i["name"]):
+        header(item["name"], "counter")
+        lines.append(f"{PREFIX}{item['name']}{_labels(item['labels'])} {item['value']}")
+    for item in sorted(snap.get("gauges", []), key=lambda i: i["name"]):
+        header(item["name"], "gauge")
+        lines.append(f"{PREFIX}{item['name']}{_labels(item['labels'])} {item['value']}")
+    for item in sorted(snap.get("histograms", []), key=lambda i: i["name"]):
+        name = item["name"]
+        header(name, "histogram")
+        cumulative = 0
+        for bound, n in zip(BUCKETS, item["buckets"]):
+            cumulative += n
+            lines.append(f"{PREFIX}{name}_bucket{_labels(item['labels'], ('le', repr(bound)))} {cumulative}")
+        lines.append(f"{PREFIX}{name}_bucket{_labels(item['labels'], ('le', '+Inf'))} {item['count']}")
+        lines.append(f"{PREFIX}{name}_sum{_labels(item['labels'])} {item['sum']:.6f}")
+        lines.append(f"{PREFIX}{name}_count{_labels(item['labels'])} {item['count']}")
+
+    header("metrics_age_seconds", "gauge")
+    lines.append(f"{PREFIX}metrics_age_seconds {time.time() - snap.get('time', 0):.1f}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,54 @@
+"""
+Bounded history of news items keyed by GUID (or link), so a poll only
+cleans the items it has not seen before. Items age out by publish date.
+Used from the news fetch only (one worker at a time), so no locking.
+"""
+import time
+import zlib
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+
+def item_key(guid, link=None, title=None):
+    ident = guid or link or title or ""
+    return f"{zlib.crc32(ident.encode('utf-8', 'ignore')):08x}"
+
+def parse_pubdate(text):
+    """RFC 822 pubDate -> epoch seconds, or None."""
+    try:
+        return parsedate_to_datetime(text).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+class NewsStore:
+    def __init__(self, max_items=100, max_age=2 * 86400):
+        self.max_items = max_items
+        self.max_age = max_age
+        self._items = OrderedDict()
+        self.added = 0
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, key, item):
+        """item must carry "published" (epoch) for ageing; oldest insertions go first when full."""
+        self._items[key] = item
+        self._items.move_to_end(key)
+        self.added += 1
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+    def touch(self, key):
+        """Mark an item as still listed in the feed (keeps it from LRU eviction)."""
+        self._items.move_to_end(key)
+
+    def expire(self, now=None):
+        cutoff = (now or time.time()) - self.max_age
+        for key in [k for k, item in self._items.items() if (item.get("published") or cutoff) < cutoff]:
+            del self._items[key]
+
+    def items(self):
+        """All items, newest publish date first."""
+        return sorted(self._items.values(), key=lambda item: item.get("published") or 0, reverse=True)
@@ -0,0 +1,116 @@
+"""
+Prayer times computed on the device with the Kemenag RI parameters
+(Subuh 20 deg, Isya 18 deg below the horizon, Ashar shadow factor 1,
+Imsak 10 minutes before Subuh, plus ihtiyat), so the sholat slide needs
+no network. A whole year is computed once into a compact table.
+
+    python3 prayer_times.py [YYYY-MM-DD]   # print the schedule for a day
+"""
+import math
+import datetime
+import threading
+from array import array
+
+import config
+
+FAJR_ANGLE = 20.0
+ISHA_ANGLE = 18.0
+SUNSET_ANGLE = 0.833    # Refraction + solar semi-diameter
+ASR_FACTOR = 1          # Shafi'i: shadow = object length + noon shadow
+IMSAK_MINUTES = 10
+
+NAMES = ("Imsak", "Subuh", "Dzuhur", "Ashar", "Maghrib", "Isya")
+
+# (year, lat, lon, tz, ihtiyat) -> array('H') of minutes after local midnight,
+# len(NAMES) entries per day of the year
+_table = {"key": None, "data": None}
+_lock = threading.Lock()
+
+def _sin(d): return math.sin(math.radians(d))
+def _cos(d): return math.cos(math.radians(d))
+def _tan(d): return math.tan(math.radians(d))
+def _acos(x): return math.degrees(math.acos(max(-1.0, min(1.0, x))))
+def _atan2(y, x): return math.degrees(math.atan2(y, x))
+
+def _sun_position(jd):
+    """Solar declination (deg) and equation of time (hours) for Julian day jd."""
+    d = jd - 2451545.0
+    g = (357.529 + 0.98560028 * d) % 360
+    q = (280.459 + 0.98564736 * d) % 360
+    lam = (q + 1.915 * _sin(g) + 0.020 * _sin(2 * g)) % 360
+    e = 23.439 - 0.00000036 * d
+    ra = (_atan2(_cos(e) * _sin(lam), _cos(lam)) / 15.0) % 24
+    decl = math.degrees(math.asin(_sin(e) * _sin(lam)))
+    eqt = q / 15.0 - ra
+    eqt = (eqt + 12) % 24 - 12
+    return decl, eqt
+
+def _day_times(date, lat, lon, tz_hours):
+    """Imsak..Isya for one date as local clock hours (floats)."""
+    # Julian day at local noon of the given longitude
+    jd = date.toordinal() + 1721424.5 - lon / 360.0
+
+    def noon(t):
+        return 12 - _sun_position(jd + t)[1]
+
+    def angle_time(angle, t, before_noon):
+        decl = _sun_position(jd + t)[0]
+        h = _acos((-_sin(angle) - _sin(decl) * _sin(lat)) / (_cos(decl) * _cos(lat))) / 15.0
+        return noon(t) + (-h if before_noon else h)
+
+    def asr_time(t):
+        decl = _sun_position(jd + t)[0]
+        angle = -math.degrees(math.atan(1.0 / (ASR_FACTOR + _tan(abs(lat - decl)))))
+        return angle_time(angle, t, False)
+
+    # Evaluate the sun's position near each event (initial guesses in hours)
+    fajr = angle_time(FAJR_ANGLE, 5 / 24.0, True)
+    dhuhr = noon(12 / 24.0)
+    asr = asr_time(13 / 24.0)
+    maghrib = angle_time(SUNSET_ANGLE, 18 / 24.0, False)
+    isha = angle_time(ISHA_ANGLE, 18 / 24.0, False)
+
+    shift = tz_hours - lon / 15.0
+    return [fajr + shift, dhuhr + shift, asr + shift, maghrib + shift, isha + shift]
+
+def build_year(year, lat, lon, tz_hours, ihtiyat=2):
+    """Minutes after local midnight for every day of `year`, NAMES order."""
+    data = array('H')
+    day = datetime.date(year, 1, 1)
+    while day.year == year:
+        subuh, dhuhr, asr, maghrib, isha = (
+            int(h * 60 + ihtiyat + 0.5) for h in _day_times(day, lat, lon, tz_hours))
+        data.extend((subuh - IMSAK_MINUTES, subuh, dhuhr, asr, maghrib, isha))
+        day += datetime.timedelta(days=1)
+    return data
+
+def _year_table(year):
+    lat = float(config.LAT)
+    lon = float(config.LON)
+    tz = getattr(config, 'TIMEZONE_OFFSET', 25200) / 3600.0
+    ihtiyat = getattr(config, 'SHOLAT_IHTIYAT', 2)
+    key = (year, lat, lon, tz, ihtiyat)
+    with _lock:
+        if _table["key"] != key:
+            _table["data"] = build_year(year, lat, lon, tz, ihtiyat)
+            _table["key"] = key
+        return _table["data"]
+
+def get_times(date=None):
+    """
+    {"Imsak": "04:03", "Subuh": ..., "Isya": ...} for date (default: today),
+    the same keys the Aladhan-based fetch used to return.
+    """
+    if date is None:
+        import date_utils
+        date = date_utils.local_now().date()
+    table = _year_table(date.year)
+    row = (date.timetuple().tm_yday - 1) * len(NAMES)
+    return {name: f"{m // 60:02d}:{m % 60:02d}"
+            for name, m in zip(NAMES, table[row:row + len(NAMES)])}
+
+if __name__ == "__main__":
+    import sys
+    day = datetime.date.fromisoformat(sys.argv[1]) if len(sys.argv) > 1 else None
+    for name, value in get_times(day).items():
+        print(f"{name:<8}{value}")
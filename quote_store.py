@@ -0,0 +1,116 @@
+"""
+Quotes packed into one binary file with an offset table and read through
+mmap, so picking a random quote touches a single record and the ~10k
+entries of quotes.json never sit on the heap.
+
+File format (little endian):
+    header   "WPQS", u16 version, u16 reserved, u32 count
+    offsets  (count + 1) u32, from the start of the file
+    records  u16 quote length, quote bytes, author bytes (UTF-8)
+
+    python3 quote_store.py      # (re)build cache/quotes.bin from quotes.json
+"""
+import os
+import mmap
+import json
+import struct
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+QUOTES_JSON = os.path.join(APP_DIR, "quotes.json")
+QUOTES_BIN = os.path.join(APP_DIR, "cache", "quotes.bin")
+
+MAGIC = b"WPQS"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+OFFSET = struct.Struct("<I")
+QUOTE_LEN = struct.Struct("<H")
+
+def _encode(text, limit=None):
+    data = str(text or "").encode("utf-8", "ignore")
+    return data[:limit].decode("utf-8", "ignore").encode("utf-8") if limit else data
+
+def build(src=QUOTES_JSON, dst=QUOTES_BIN):
+    """Pack quotes.json into dst (written atomically). Returns the record count."""
+    with open(src, "r", encoding="utf-8") as f:
+        items = json.load(f)
+    records = []
+    for item in items:
+        if not isinstance(item, dict) or not item.get("quote"):
+            continue
+        quote = _encode(item["quote"], 0xFFFF)
+        records.append(QUOTE_LEN.pack(len(quote)) + quote + _encode(item.get("author")))
+    del items
+    offsets = []
+    pos = HEADER.size + OFFSET.size * (len(records) + 1)
+    for record in records:
+        offsets.append(pos)
+        pos += len(record)
+    offsets.append(pos)
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp = dst + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(records)))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        for record in records:
+            f.write(record)
+    os.replace(tmp, dst)
+    return len(records)
+
+class QuoteStore:
+    """Read-only view of a packed quotes file; safe to share between threads."""
+    def __init__(self, path=QUOTES_BIN):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, _, count = HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"unsupported quote file {path}")
+            end = HEADER.size + OFFSET.size * count
+            if len(self._mm) < end + OFFSET.size or OFFSET.unpack_from(self._mm, end)[0] != len(self._mm):
+                raise ValueError(f"truncated quote file {path}")
+        except Exception:
+            self._mm.close()
+            raise
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def get(self, i):
+        """Record i as {'quote', 'author'}."""
+        start, end = struct.unpack_from("<2I", self._mm, HEADER.size + OFFSET.size * i)
+        n = QUOTE_LEN.unpack_from(self._mm, start)[0]
+        body = start + QUOTE_LEN.size
+        return {
+            'quote': self._mm[body:body + n].decode("utf-8", "replace"),
+            'author': self._mm[body + n:end].decode("utf-8", "replace"),
+        }
+
+    def close(self):
+        self._mm.close()
+
+def is_stale(src=QUOTES_JSON, dst=QUOTES_BIN):
+    """True if dst is missing or older than src."""
+    try:
+        return os.path.getmtime(dst) < os.path.getmtime(src)
+    except FileNotFoundError:
+        return os.path.exists(src)
+
+def open_store(src=QUOTES_JSON, dst=QUOTES_BIN):
+    """
+    Open the packed store, (re)building it first when quotes.json is newer.
+    Returns None if it cannot be built or read (caller falls back to JSON).
+    """
+    try:
+        if is_stale(src, dst):
+            print(f"Packed {build(src, dst)} quotes into {dst}")
+        return QuoteStore(dst)
+    except Exception as e:
+        print(f"Quote store unavailable: {e}")
+        return None
+
+if __name__ == "__main__":
+    import sys
+    src = sys.argv[1] if len(sys.argv) > 1 else QUOTES_JSON
+    dst = sys.argv[2] if len(sys.argv) > 2 else QUOTES_BIN
+    print(f"Packed {build(src, dst)} quotes into {dst} ({os.path.getsize(dst)} bytes)")
@@ -0,0 +1,55 @@
+"""
+One sanitizer for all upstream text, run once when data is ingested.
+
+Pygame 1.9.6 crashes on characters outside the Basic Multilingual Plane,
+and control characters render as boxes. clean() strips both with a
+precompiled translate table and regex and returns a CleanStr, which the
+render path (main.SafeFont) passes through without looking at it again.
+"""
+import re
+import html
+
+class CleanStr(str):
+    """A str that already went through clean()."""
+    __slots__ = ()
+
+_ASTRAL = re.compile("[\U00010000-\U0010FFFF]+")
+_TAGS = re.compile(r"<[^<]+?>")
+# C0 controls except tab/newline/CR, plus the non-characters U+FFFE/U+FFFF
+_TABLE = dict.fromkeys([c for c in range(32) if c not in (9, 10, 13)] + [0xFFFE, 0xFFFF])
+
+def clean(text):
+    if type(text) is CleanStr:
+        return text
+    if not isinstance(text, str):
+        text = str(text)
+    return CleanStr(_ASTRAL.sub("", text).translate(_TABLE))
+
+def clean_html(text):
+    """Unescape entities, drop tags, clean and trim an RSS/HTML snippet."""
+    if not text:
+        return CleanStr("")
+    return CleanStr(clean(_TAGS.sub("", html.unescape(text))).strip())
+
+def clean_data(data):
+    """Recursively clean every string in a payload; CleanStr values are kept as is."""
+    if isinstance(data, str):
+        return clean(data)
+    if isinstance(data, dict):
+        return {k: clean_data(v) for k, v in data.items()}
+    if isinstance(data, list):
+        return [clean_data(item) for item in data]
+    return data
+
+def ensure_clean(text):
+    """
+    Render-time guard: CleanStr and pure-ASCII text (checked in C) are
+    returned untouched; anything else is cleaned.
+    """
+    if type(text) is CleanStr:
+        return text
+    if not isinstance(text, str):
+        text = str(text)
+    if text.isascii():
+        return text
+    return clean(text)
@@ -0,0 +1,96 @@
+import heapq
+import threading
+import time
+
+class Scheduler:
+    """
+    Deadline-driven event scheduler backed by a heap.
+
+    Jobs are registered by name with a first delay. When a job fires its
+    callback may return the delay (seconds) until it should fire again;
+    returning None re-arms it with its default interval, or drops it if it
+    has none. The render loop sleeps in wait() until the earliest deadline,
+    or until another thread calls wake() (e.g. a fetch result landed).
+
+    Deadlines use a monotonic clock: the Pi has no RTC and boots on
+    fake-hwclock time, so the wall clock jumps when NTP syncs. Jobs tied
+    to wall time (next minute, local midnight) compute their delay from
+    time.time() and return it.
+    """
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._heap = []
+        self._jobs = {}
+        self._seq = 0
+        self._wake = threading.Event()
+
+    def add(self, name, callback, delay=0, interval=None):
+        """Register (or replace) a job that first fires after `delay` seconds."""
+        self._jobs[name] = {"callback": callback, "interval": interval}
+        self._arm(name, delay)
+
+    def cancel(self, name):
+        self._jobs.pop(name, None)
+
+    def reschedule(self, name, delay):
+        """Move an existing job's next deadline to now + delay."""
+        if name in self._jobs:
+            self._arm(name, delay)
+
+    def _arm(self, name, delay):
+        self._seq += 1
+        job = self._jobs[name]
+        job["seq"] = self._seq
+        heapq.heappush(self._heap, (self.clock() + max(0, delay), self._seq, name))
+
+    def next_deadline(self):
+        # Drop stale heap entries left by cancel()/reschedule()
+        while self._heap:
+            deadline, seq, name = self._heap[0]
+            job = self._jobs.get(name)
+            if job is not None and job["seq"] == seq:
+                return deadline
+            heapq.heappop(self._heap)
+        return None
+
+    def run_pending(self):
+        """Fire every job whose deadline has passed. Returns the number fired."""
+        fired = 0
+        now = self.clock()
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > now:
+                break
+            _, seq, name = heapq.heappop(self._heap)
+            job = self._jobs[name]
+            try:
+                delay = job["callback"]()
+            except Exception as e:
+                print(f"Scheduler job error ({name}): {e}")
+                delay = None
+            fired += 1
+            # Callback may have cancelled or re-armed itself
+            if self._jobs.get(name) is not job or job["seq"] != seq:
+                continue
+            if delay is None:
+                delay = job["interval"]
+            if delay is None:
+                del self._jobs[name]
+            else:
+                self._arm(name, delay)
+        return fired
+
+    def wait(self, max_sleep=None):
+        """Sleep until the next deadline or until wake() is called."""
+        deadline = self.next_deadline()
+        timeout = max_sleep
+        if deadline is not None:
+            timeout = max(0, deadline - self.clock())
+            if max_sleep is not None:
+                timeout = min(timeout, max_sleep)
+        self._wake.wait(timeout)
+        self._wake.clear()
+
+    def wake(self):
+        """Interrupt wait(). Safe to call from any thread."""
+        self._wake.set()
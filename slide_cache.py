@@ -0,0 +1,38 @@
+from collections import OrderedDict
+
+class SlideCache:
+    """
+    LRU of fully rendered slide surfaces.
+
+    Keys are built by the caller from everything a slide depends on:
+    (slide type, data versions, page, HH:MM). A hit means the slide can be
+    shown with one blit instead of re-rendering every text line and icon.
+    """
+    def __init__(self, max_items=8):
+        self.max_items = max_items
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        surf = self._surfaces.get(key)
+        if surf is None:
+            self.misses += 1
+            return None
+        self._surfaces.move_to_end(key)
+        self.hits += 1
+        return surf
+
+    def put(self, key, surface):
+        """Store a copy of surface (the canvas is reused for the next frame)."""
+        self._surfaces[key] = surface.copy()
+        self._surfaces.move_to_end(key)
+        while len(self._surfaces) > self.max_items:
+            self._surfaces.popitem(last=False)
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return (self.hits / total) if total else 0.0
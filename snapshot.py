@@ -0,0 +1,59 @@
+import os
+import json
+import time
+
+import sanitize
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_FILE = os.path.join(APP_DIR, "cache", "state.json")
+
+# Bump when the payload layout of any source changes incompatibly
+SNAPSHOT_VERSION = 1
+
+def save(store, keys, path=SNAPSHOT_FILE):
+    """
+    Persist the last good payload of every source in `keys` with its fetch
+    time and TTL. Written to a temp file, fsynced and renamed, so a power
+    cut leaves either the old or the new snapshot, never a torn one.
+    """
+    sources = {}
+    for key, (value, fetched_at, ttl) in store.export(keys).items():
+        sources[key] = {"t": round(fetched_at, 1), "ttl": ttl, "data": value}
+    blob = json.dumps({"v": SNAPSHOT_VERSION, "saved": round(time.time(), 1), "sources": sources},
+                      separators=(",", ":"), ensure_ascii=False, default=str)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        return len(sources)
+    except Exception as e:
+        print(f"Snapshot save error: {e}")
+        return 0
+
+def load(store, path=SNAPSHOT_FILE):
+    """Restore a snapshot into the store, keeping the original fetch times. Returns sources loaded."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            snap = json.load(f)
+    except FileNotFoundError:
+        return 0
+    except Exception as e:
+        print(f"Snapshot load error: {e}")
+        return 0
+    if snap.get("v") != SNAPSHOT_VERSION:
+        return 0
+
+    loaded = 0
+    for key, entry in snap.get("sources", {}).items():
+        if entry.get("data") is None:
+            continue
+        if entry.get("ttl") is not None:
+            store.set_ttl(key, entry["ttl"])
+        # Saved data was sanitized at ingest; mark it clean again
+        store.set(key, sanitize.clean_data(entry["data"]), fetched_at=entry.get("t"))
+        loaded += 1
+    return loaded
@@ -0,0 +1,79 @@
+from functools import lru_cache
+
+ELLIPSIS = "..."
+
+# (font, word) -> pixel width. Fonts live for the whole process.
+_word_widths = {}
+
+def word_width(font, word):
+    key = (id(font), word)
+    w = _word_widths.get(key)
+    if w is None:
+        if len(_word_widths) > 4096:
+            _word_widths.clear()
+        w = font.size(word)[0]
+        _word_widths[key] = w
+    return w
+
+def _split_long_word(font, word, max_width):
+    """Hard-break a single word that is wider than the line."""
+    parts = []
+    current = ""
+    for ch in word:
+        if current and word_width(font, current + ch) > max_width:
+            parts.append(current)
+            current = ch
+        else:
+            current += ch
+    if current:
+        parts.append(current)
+    return parts
+
+def _fit_ellipsis(font, line, max_width):
+    """Shorten line until line + ELLIPSIS fits in max_width."""
+    while line and word_width(font, line + ELLIPSIS) > max_width:
+        cut = line.rfind(" ")
+        line = line[:cut] if cut > 0 else line[:-1]
+        line = line.rstrip()
+    return line + ELLIPSIS
+
+@lru_cache(maxsize=256, typed=True)
+def wrap(text, font, max_width, max_lines=None):
+    """
+    Break text into lines no wider than max_width pixels, measured with font.
+    If the text needs more than max_lines, the last line ends with an ellipsis.
+    Returns a tuple of strings; results are memoized per (text, font, width, lines),
+    so each news item / quote is laid out once instead of every frame.
+    Lines keep the type of text, so sanitize.CleanStr input stays marked clean.
+    """
+    if not text:
+        return ()
+    space = word_width(font, " ")
+    lines = []
+    current = []
+    current_w = 0
+
+    for word in text.split():
+        w = word_width(font, word)
+        if w > max_width:
+            pieces = _split_long_word(font, word, max_width)
+        else:
+            pieces = [word]
+        for piece in pieces:
+            pw = w if len(pieces) == 1 else word_width(font, piece)
+            if current and current_w + space + pw > max_width:
+                lines.append(" ".join(current))
+                current = [piece]
+                current_w = pw
+            else:
+                current_w += (space if current else 0) + pw
+                current.append(piece)
+    if current:
+        lines.append(" ".join(current))
+
+    if max_lines is not None and len(lines) > max_lines:
+        lines = lines[:max_lines]
+        lines[-1] = _fit_ellipsis(font, lines[-1], max_width)
+    if type(text) is not str:
+        return tuple(type(text)(line) for line in lines)
+    return tuple(lines)
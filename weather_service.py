@@ -1,10 +1,14 @@
-import requests
 import config
 
+OWM_UPDATE_PERIOD = 600 # OWM refreshes current conditions about every 10 minutes
+
 def get_weather(lat=None, lon=None, city=None):
     """
     Fetches the current weather using Coordinates or City name.
     """
+    import http_client
+    import fetcher
+    
     if lat and lon:
         url = f"http://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={config.API_KEY}&units={config.UNITS}&lang=id"
     else:
@@ -12,15 +16,19 @@ def get_weather(lat=None, lon=None, city=None):
         url = f"http://api.openweathermap.org/data/2.5/weather?q={target_city}&appid={config.API_KEY}&units={config.UNITS}&lang=id"
     
     try:
-        response = requests.get(url, timeout=10)
-        # If not found or error, fallback to Jakarta if not already there
-        if response.status_code != 200:
+        response = http_client.get(url)
+        # If the city is not found, fallback to Jakarta if not already there
+        if 400 <= response.status_code < 500:
             if not lat and city != "Jakarta,ID":
                 return get_weather(city="Jakarta,ID")
             
         response.raise_for_status()
         data = response.json()
         
+        # Observation time: the next one is not due before dt + OWM_UPDATE_PERIOD
+        if "dt" in data:
+            fetcher.hint_expires(data["dt"] + OWM_UPDATE_PERIOD)
+        
         weather_info = {
             "temp": data["main"]["temp"],
             "humidity": data["main"]["humidity"],
@@ -33,8 +41,6 @@ def get_weather(lat=None, lon=None, city=None):
         return weather_info
     except Exception as e:
         print(f"Error fetching weather: {e}")
-        if not lat and city != "Jakarta,ID":
-            return get_weather(city="Jakarta,ID")
         return None
 
 if __name__ == "__main__":